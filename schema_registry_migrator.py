@@ -2,11 +2,36 @@
 
 import os
 import json
+import time
+import hashlib
+import random
 import logging
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple, Any
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+try:
+    # Optional, considerably faster JSON parsing/serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional, lets the bulk /schemas response be parsed as it streams in
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    # Optional, faster non-cryptographic hashing for schema fingerprints
+    import xxhash
+except ImportError:
+    xxhash = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,13 +43,110 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# HTTP status codes that indicate a transient failure worth retrying
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Content type expected by the Schema Registry REST API for request bodies
+SCHEMA_REGISTRY_CONTENT_TYPE = "application/vnd.schemaregistry.v1+json"
+
+# Page size for the bulk /schemas endpoint; registries cap unpaged results
+# (schema.search.max.limit), so the listing is always requested in pages
+BULK_SCHEMAS_PAGE_SIZE = 1000
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode an object as JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+@lru_cache(maxsize=256)
+def _schema_payload(schema: str, schema_type: str) -> bytes:
+    """Return the encoded ``{"schema", "schemaType"}`` request body.
+
+    Migrating a version posts the same body to several endpoints (existence
+    check, compatibility check, registration and its retries), so recently
+    used bodies are memoized rather than re-serialized each time.
+    """
+    return _json_dumps({"schema": schema, "schemaType": schema_type})
+
+def _canonical_schema(schema: str) -> bytes:
+    """Return a canonical byte form of a schema for equality checks.
+
+    JSON schemas (AVRO and JSON Schema) are re-serialized with sorted keys and
+    no insignificant whitespace, so formatting differences don't matter.
+    Anything that isn't JSON (e.g. PROTOBUF) is used verbatim.
+    """
+    try:
+        parsed = _json_loads(schema)
+    except ValueError:
+        return schema.encode('utf-8')
+    if orjson is not None:
+        return orjson.dumps(parsed, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(parsed, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def _schema_fingerprint(schema: str) -> int:
+    """Return a 64-bit hash of the canonical form of a schema.
+
+    Uses xxHash (XXH3) when it is installed, BLAKE2b otherwise. Fingerprints
+    are only compared within a single run, so the choice doesn't matter.
+    """
+    canonical = _canonical_schema(schema)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(canonical)
+    digest = hashlib.blake2b(canonical, digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def _record_fingerprint(record: Dict) -> int:
+    """Return the fingerprint of a schema record, computing it if it wasn't stored."""
+    fingerprint = record.get('schema_hash')
+    if fingerprint is None:
+        fingerprint = _schema_fingerprint(record['schema'])
+    return fingerprint
+
+def _schema_record(version: int, schema_info: Dict) -> Dict:
+    """Build the per-version schema record used throughout the migrator."""
+    schema = schema_info.get('schema')
+    return {
+        'version': version,
+        'id': schema_info.get('id'),
+        'schema': schema,
+        'schemaType': schema_info.get('schemaType', 'AVRO'),
+        'schema_hash': _schema_fingerprint(schema)
+    }
+
+def build_session(pool_size: int = 20) -> requests.Session:
+    """Create a requests session with a keep-alive pool of ``pool_size`` connections.
+
+    Retries are not configured on the adapter; SchemaRegistryClient retries
+    transient failures itself with jittered backoff. A session can be passed
+    to several clients talking to the same registry so they share one pool.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 class SchemaRegistryClient:
     def __init__(
         self,
         url: str,
         username: Optional[str] = None,
         password: Optional[str] = None,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        max_workers: int = 10,
+        pool_size: int = 20,
+        max_retries: int = 3,
+        timeout: Tuple[float, float] = (5, 120),
+        cache_ttl: float = 30.0,
+        session: Optional[requests.Session] = None,
+        cache_dir: Optional[str] = None
     ):
         # Validate username and password
         if (username is None) != (password is None):
@@ -33,39 +155,161 @@ class SchemaRegistryClient:
         self.url = url.rstrip('/')
         self.auth = (username, password) if username and password else None
         self.context = context
-        self.session = requests.Session()
-        if self.auth:
-            self.session.auth = self.auth
+        # Base URL for all API paths, including the context prefix if any
+        self._base_url = f"{self.url}/contexts/{context}" if context else self.url
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        # Short-lived caches for idempotent GETs that are repeated per subject
+        self.cache_ttl = cache_ttl
+        self._mode_cache: Dict[str, Tuple[float, str]] = {}
+        # Compatibility levels, cached for cache_ttl like modes; a subject maps
+        # to None when it has no subject-level level set
+        self._config_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._global_compat_cache: Optional[Tuple[float, str]] = None
+        self._subjects_cache: Optional[Tuple[float, List[str]]] = None
+        # Per-subject schema lists, cached for cache_ttl like the subject list
+        # (other clients may add or delete versions) and dropped as soon as
+        # this client registers or deletes the subject
+        self._schema_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        # Compatibility check results per subject, keyed by (schema type,
+        # schema fingerprint, version); dropped when the subject's versions or
+        # compatibility level change
+        self._compat_cache: Dict[str, Dict[Tuple[str, int, str], bool]] = {}
+        # check_schema_exists lookups per subject, keyed by (schema type,
+        # schema fingerprint); dropped when this client registers to or
+        # deletes the subject
+        self._exists_cache: Dict[str, Dict[Tuple[str, int], Optional[Dict]]] = {}
+        # Optional on-disk cache of schema versions fetched one by one, kept
+        # between runs so unchanged versions aren't downloaded again
+        self._disk_cache_path = None
+        self._disk_cache: Dict[str, Dict[str, Dict]] = {}
+        if cache_dir:
+            key = hashlib.blake2b(f"{self.url}|{context or ''}".encode('utf-8'), digest_size=8).hexdigest()
+            self._disk_cache_path = os.path.join(cache_dir, f"schemas-{key}.json")
+            self._load_disk_cache()
+        # Keep enough pooled keep-alive connections for every worker thread so
+        # that concurrent requests reuse sockets instead of reconnecting.
+        # A caller-provided session is used as-is and may be shared by clients
+        # with different credentials, so _request sends auth per request.
+        if session is not None:
+            self.session = session
+        else:
+            self.session = build_session(max(pool_size, max_workers))
+            if self.auth:
+                self.session.auth = self.auth
         logger.info(f"Initialized SchemaRegistryClient for {url}")
 
     def _get_url(self, path: str) -> str:
         """Construct URL with optional context."""
-        if self.context:
-            return f"{self.url}/contexts/{self.context}{path}"
-        return f"{self.url}{path}"
+        return self._base_url + path
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures with exponential backoff.
+
+        Connection errors, timeouts and 429/5xx responses are retried up to
+        ``max_retries`` times; a ``Retry-After`` header given in seconds is
+        honoured (capped at 60s). Any other response is returned as-is so callers
+        can handle it with ``raise_for_status()``. A ``json`` body is
+        serialized with :func:`_json_dumps` unless it is already encoded bytes.
+        """
+        url = self._get_url(path)
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('auth', self.auth)
+        if 'json' in kwargs:
+            body = kwargs.pop('json')
+            kwargs['data'] = body if isinstance(body, bytes) else _json_dumps(body)
+            kwargs['headers'] = {"Content-Type": SCHEMA_REGISTRY_CONTENT_TYPE, **(kwargs.get('headers') or {})}
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                reason = str(e)
+            delay = min(30.0, 2 ** attempt * (1 + random.uniform(0, 0.5)))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(60.0, float(retry_after)))
+            logger.warning(f"{method} {url} failed ({reason}), retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _load_disk_cache(self) -> None:
+        """Load the on-disk schema cache, starting empty if it is missing or unreadable."""
+        try:
+            with open(self._disk_cache_path, 'rb') as f:
+                self._disk_cache = _json_loads(f.read())
+            logger.debug("Loaded schema cache from %s", self._disk_cache_path)
+        except FileNotFoundError:
+            self._disk_cache = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schema cache {self._disk_cache_path}: {e}")
+            self._disk_cache = {}
+
+    def _save_disk_cache(self) -> None:
+        """Atomically write the on-disk schema cache."""
+        try:
+            os.makedirs(os.path.dirname(self._disk_cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self._disk_cache_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps(self._disk_cache))
+            os.replace(tmp_path, self._disk_cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write schema cache {self._disk_cache_path}: {e}")
+
+    def _cached_schemas(self, subject: str) -> Optional[List[Dict]]:
+        """Return the cached schema list for a subject, or None if missing or expired."""
+        cached = self._schema_cache.get(subject)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+
+    def _invalidate_subject_cache(self, subject: str) -> None:
+        """Drop cached data for a subject that is being created or deleted."""
+        self._mode_cache.pop(subject, None)
+        self._config_cache.pop(subject, None)
+        self._schema_cache.pop(subject, None)
+        self._disk_cache.pop(subject, None)
+        self._compat_cache.pop(subject, None)
+        self._exists_cache.pop(subject, None)
+        self._subjects_cache = None
 
     def get_subjects(self) -> List[str]:
-        """Get list of all subjects."""
-        response = self.session.get(self._get_url("/subjects"))
+        """Get list of all subjects.
+
+        The list is cached for ``cache_ttl`` seconds and invalidated whenever
+        this client registers or deletes a subject.
+        """
+        cached = self._subjects_cache
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return list(cached[1])
+        response = self._request("GET", "/subjects")
         response.raise_for_status()
-        subjects = response.json()
+        subjects = _json_loads(response.content)
+        self._subjects_cache = (time.monotonic(), subjects)
         logger.info(f"Retrieved {len(subjects)} subjects from registry")
-        return subjects
+        return list(subjects)
 
     def get_versions(self, subject: str) -> List[int]:
         """Get all versions for a subject."""
-        response = self.session.get(self._get_url(f"/subjects/{subject}/versions"))
+        response = self._request("GET", f"/subjects/{subject}/versions")
         response.raise_for_status()
-        versions = response.json()
-        logger.debug(f"Retrieved {len(versions)} versions for subject {subject}")
+        versions = _json_loads(response.content)
+        logger.debug("Retrieved %d versions for subject %s", len(versions), subject)
         return versions
 
     def get_latest_version(self, subject: str) -> Optional[int]:
         """Get the latest version number for a subject."""
         try:
-            response = self.session.get(self._get_url(f"/subjects/{subject}/versions/latest"))
+            response = self._request("GET", f"/subjects/{subject}/versions/latest")
             response.raise_for_status()
-            schema_info = response.json()
+            schema_info = _json_loads(response.content)
             return schema_info.get('version')
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -74,28 +318,39 @@ class SchemaRegistryClient:
             raise
 
     def get_schema(self, subject: str, version: int) -> Dict:
-        """Get schema for a specific subject and version."""
-        response = self.session.get(
-            self._get_url(f"/subjects/{subject}/versions/{version}")
-        )
+        """Get schema for a specific subject and version.
+
+        Numbered versions of subjects in this client's schema cache are
+        answered from the cache while it is fresh; ``latest`` always goes to
+        the registry.
+        """
+        if isinstance(version, int):
+            for record in self._cached_schemas(subject) or ():
+                if record['version'] == version:
+                    return {
+                        'subject': subject,
+                        'version': version,
+                        'id': record['id'],
+                        'schema': record['schema'],
+                        'schemaType': record['schemaType']
+                    }
+        response = self._request("GET", f"/subjects/{subject}/versions/{version}")
         response.raise_for_status()
-        schema_info = response.json()
-        logger.debug(f"Retrieved schema for subject {subject} version {version}")
+        schema_info = _json_loads(response.content)
+        logger.debug("Retrieved schema for subject %s version %s", subject, version)
         return schema_info
 
     def get_subject_schemas(self, subject: str) -> List[Dict]:
         """Get all schemas for a specific subject."""
+        cached = self._cached_schemas(subject)
+        if cached:
+            return list(cached)
         try:
             versions = self.get_versions(subject)
             schemas = []
             for version in versions:
                 schema_info = self.get_schema(subject, version)
-                schemas.append({
-                    'version': version,
-                    'id': schema_info.get('id'),
-                    'schema': schema_info.get('schema'),
-                    'schemaType': schema_info.get('schemaType', 'AVRO')
-                })
+                schemas.append(_schema_record(version, schema_info))
             return schemas
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -103,62 +358,216 @@ class SchemaRegistryClient:
                 return []
             raise
 
-    def get_all_schemas(self) -> Dict[str, List[Dict]]:
-        """Get all schemas with their versions."""
+    def get_schemas_bulk(self) -> Optional[Dict[str, List[Dict]]]:
+        """Get every registered schema version from the ``/schemas`` endpoint.
+
+        The listing is requested in pages of ``BULK_SCHEMAS_PAGE_SIZE`` and
+        grouped by subject, with each subject's versions sorted ascending.
+        Paging continues until a page adds no new versions, since registries
+        may cap the page size below the requested limit. If that page was not
+        empty the registry ignored ``offset``, so the last subject seen may
+        be incomplete and is left out for the caller to fetch per version.
+        Returns None if the registry does not support the endpoint.
+
+        When ijson is installed each page is parsed incrementally while it
+        is being downloaded, instead of first buffering the whole array.
+        """
         schemas = {}
+        seen = set()
+        offset = 0
+        last_subject = None
+        while True:
+            response = self._request(
+                "GET",
+                f"/schemas?latestOnly=false&deleted=false&offset={offset}&limit={BULK_SCHEMAS_PAGE_SIZE}",
+                stream=ijson is not None
+            )
+            if not response.ok:
+                response.close()
+                if offset == 0 and response.status_code in (400, 404):
+                    logger.debug("Bulk /schemas endpoint not available (%s)", response.status_code)
+                    return None
+                response.raise_for_status()
+            
+            if ijson is not None:
+                response.raw.decode_content = True
+                schema_infos = ijson.items(response.raw, 'item')
+            else:
+                schema_infos = _json_loads(response.content)
+            
+            count = 0
+            added = 0
+            try:
+                for schema_info in schema_infos:
+                    count += 1
+                    last_subject = schema_info['subject']
+                    key = (last_subject, schema_info.get('version'))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    added += 1
+                    schemas.setdefault(schema_info['subject'], []).append(
+                        _schema_record(schema_info.get('version'), schema_info)
+                    )
+            finally:
+                response.close()
+            
+            if added == 0:
+                if count:
+                    # Same page again: offset is ignored and the listing may
+                    # have been cut off partway through the last subject
+                    schemas.pop(last_subject, None)
+                break
+            offset += count
+        
+        for versions in schemas.values():
+            versions.sort(key=itemgetter('version'))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Retrieved %d schema versions via /schemas", sum(len(v) for v in schemas.values()))
+        return schemas
+
+    def get_all_schemas(self) -> Dict[str, List[Dict]]:
+        """Get all schemas with their versions.
+
+        Subjects fetched by this client in the last ``cache_ttl`` seconds are
+        served from its schema cache, so repeated calls only hit the registry
+        for subjects that are new, expired, or were registered to or deleted
+        since. On a cold cache the bulk
+        ``/schemas`` endpoint is tried first. Subjects it does not cover (or
+        all subjects, on registries without the endpoint) are fetched per
+        version, concurrently using up to ``max_workers`` threads sharing
+        this client's session; with ``cache_dir`` set, versions downloaded
+        by an earlier run are read from disk instead, after one version per
+        subject confirms the cached schema IDs are still current. Each
+        subject's versions are sorted ascending.
+        """
         subjects = self.get_subjects()
+        schemas = {subject: list(self._cached_schemas(subject) or ()) for subject in subjects}
+        remaining = [subject for subject in subjects if not schemas[subject]]
+        # Only subjects downloaded by this call are (re)cached below, so the
+        # age of entries served from the cache isn't reset
+        uncached = list(remaining)
         
-        for subject in subjects:
-            versions = self.get_versions(subject)
-            schemas[subject] = []
-            for version in versions:
-                schema_info = self.get_schema(subject, version)
-                schemas[subject].append({
-                    'version': version,
+        if remaining and len(remaining) == len(subjects):
+            bulk_schemas = self.get_schemas_bulk()
+            if bulk_schemas is not None:
+                for subject, versions in bulk_schemas.items():
+                    if subject in schemas:
+                        schemas[subject] = versions
+            remaining = [subject for subject in subjects if not schemas[subject]]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            subject_versions = list(executor.map(self.get_versions, remaining))
+            pairs = [
+                (subject, version)
+                for subject, versions in zip(remaining, subject_versions)
+                for version in sorted(versions)
+            ]
+            disk_cache = self._disk_cache
+            # Cached versions are reused only while the subject still lists
+            # all of them and the newest of them still has the cached schema
+            # ID; otherwise the subject was deleted and re-created since the
+            # cache was written, and all of its versions are downloaded again
+            check_pairs = []
+            for subject, versions in zip(remaining, subject_versions):
+                cached = disk_cache.get(subject)
+                if not cached:
+                    continue
+                if set(cached) <= {str(version) for version in versions}:
+                    check_pairs.append((subject, max(map(int, cached))))
+                else:
+                    del disk_cache[subject]
+            checked = set(check_pairs)
+            fetch_pairs = [
+                (subject, version)
+                for subject, version in pairs
+                if (subject, version) in checked or str(version) not in disk_cache.get(subject, {})
+            ]
+            fetched = dict(zip(fetch_pairs, executor.map(lambda pair: self.get_schema(*pair), fetch_pairs)))
+            stale = {
+                subject
+                for subject, version in check_pairs
+                if fetched[(subject, version)].get('id') != disk_cache[subject][str(version)].get('id')
+            }
+            if stale:
+                logger.info(f"Schema cache is out of date for {len(stale)} subjects, downloading them again")
+                for subject in stale:
+                    del disk_cache[subject]
+                refetch_pairs = [pair for pair in pairs if pair[0] in stale and pair not in fetched]
+                fetched.update(zip(refetch_pairs, executor.map(lambda pair: self.get_schema(*pair), refetch_pairs)))
+                fetch_pairs += refetch_pairs
+            for subject, version in pairs:
+                schema_info = fetched.get((subject, version))
+                if schema_info is None:
+                    schema_info = disk_cache[subject][str(version)]
+                schemas[subject].append(_schema_record(version, schema_info))
+        
+        if self._disk_cache_path:
+            for subject, version in fetch_pairs:
+                schema_info = fetched[(subject, version)]
+                disk_cache.setdefault(subject, {})[str(version)] = {
                     'id': schema_info.get('id'),
                     'schema': schema_info.get('schema'),
                     'schemaType': schema_info.get('schemaType', 'AVRO')
-                })
+                }
+            for subject in set(disk_cache) - set(subjects):
+                del disk_cache[subject]
+            self._save_disk_cache()
+            logger.debug("Fetched %d of %d schema versions; the rest came from the schema cache", len(fetch_pairs), len(pairs))
         
+        now = time.monotonic()
+        for subject in uncached:
+            if schemas[subject]:
+                self._schema_cache[subject] = (now, list(schemas[subject]))
         logger.info(f"Retrieved schemas for {len(schemas)} subjects")
         return schemas
 
     def get_subject_mode(self, subject: str) -> str:
-        """Get the mode for a specific subject."""
+        """Get the mode for a specific subject.
+
+        The mode is cached for ``cache_ttl`` seconds; set_subject_mode keeps
+        the cached value up to date.
+        """
+        cached = self._mode_cache.get(subject)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
         try:
-            response = self.session.get(self._get_url(f"/mode/{subject}"))
+            response = self._request("GET", f"/mode/{subject}")
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
             mode = result.get('mode', 'READWRITE')
-            logger.debug(f"Subject {subject} mode: {mode}")
-            return mode
+            logger.debug("Subject %s mode: %s", subject, mode)
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                # Subject mode not set, defaults to READWRITE
-                logger.debug(f"Subject {subject} has no specific mode set, defaulting to READWRITE")
-                return 'READWRITE'
-            raise
+            if e.response.status_code != 404:
+                raise
+            # Subject mode not set, defaults to READWRITE
+            logger.debug("Subject %s has no specific mode set, defaulting to READWRITE", subject)
+            mode = 'READWRITE'
+        self._mode_cache[subject] = (time.monotonic(), mode)
+        return mode
 
     def set_subject_mode(self, subject: str, mode: str) -> Dict:
         """Set the mode for a specific subject."""
         payload = {"mode": mode}
-        response = self.session.put(
-            self._get_url(f"/mode/{subject}"),
+        response = self._request(
+            "PUT",
+            f"/mode/{subject}",
             json=payload
         )
         response.raise_for_status()
-        result = response.json()
+        result = _json_loads(response.content)
+        self._mode_cache[subject] = (time.monotonic(), mode)
         logger.info(f"Set subject {subject} mode to {mode}")
         return result
 
     def get_global_mode(self) -> str:
         """Get the global mode for the Schema Registry."""
         try:
-            response = self.session.get(self._get_url("/mode"))
+            response = self._request("GET", "/mode")
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
             mode = result.get('mode', 'READWRITE')
-            logger.debug(f"Global mode: {mode}")
+            logger.debug("Global mode: %s", mode)
             return mode
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -170,97 +579,139 @@ class SchemaRegistryClient:
     def set_global_mode(self, mode: str) -> Dict:
         """Set the global mode for the Schema Registry."""
         payload = {"mode": mode}
-        response = self.session.put(
-            self._get_url("/mode"),
+        response = self._request(
+            "PUT",
+            "/mode",
             json=payload
         )
         response.raise_for_status()
-        result = response.json()
+        result = _json_loads(response.content)
         logger.info(f"Set global mode to {mode}")
         return result
 
     def get_global_compatibility(self) -> str:
-        """Get the global compatibility level for the Schema Registry."""
+        """Get the global compatibility level for the Schema Registry.
+
+        The level is cached for ``cache_ttl`` seconds; set_global_compatibility
+        keeps the cached value up to date.
+        """
+        cached = self._global_compat_cache
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
         try:
-            response = self.session.get(self._get_url("/config"))
+            response = self._request("GET", "/config")
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
             compatibility = result.get('compatibilityLevel', 'BACKWARD')
-            logger.debug(f"Global compatibility: {compatibility}")
-            return compatibility
+            logger.debug("Global compatibility: %s", compatibility)
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                # No global compatibility set, defaults to BACKWARD
-                logger.debug("No global compatibility set, defaulting to BACKWARD")
-                return 'BACKWARD'
-            raise
+            if e.response.status_code != 404:
+                raise
+            # No global compatibility set, defaults to BACKWARD
+            logger.debug("No global compatibility set, defaulting to BACKWARD")
+            compatibility = 'BACKWARD'
+        self._global_compat_cache = (time.monotonic(), compatibility)
+        return compatibility
 
     def set_global_compatibility(self, compatibility: str) -> Dict:
         """Set the global compatibility level for the Schema Registry."""
         payload = {"compatibility": compatibility}
-        response = self.session.put(
-            self._get_url("/config"),
-            json=payload,
-            headers={"Content-Type": "application/vnd.schemaregistry.v1+json"}
+        self._compat_cache.clear()
+        self._global_compat_cache = None
+        response = self._request(
+            "PUT",
+            "/config",
+            json=payload
         )
         response.raise_for_status()
-        result = response.json()
+        result = _json_loads(response.content)
+        self._global_compat_cache = (time.monotonic(), compatibility)
         logger.info(f"Set global compatibility to {compatibility}")
         return result
 
     def get_subject_compatibility(self, subject: str) -> Optional[str]:
-        """Get the compatibility level for a specific subject."""
+        """Get the compatibility level for a specific subject.
+
+        The level is cached for ``cache_ttl`` seconds, like subject modes.
+        """
+        cached = self._config_cache.get(subject)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
         try:
-            response = self.session.get(self._get_url(f"/config/{subject}"))
+            response = self._request("GET", f"/config/{subject}")
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
             compatibility = result.get('compatibilityLevel')
-            logger.debug(f"Subject {subject} compatibility: {compatibility}")
-            return compatibility
+            logger.debug("Subject %s compatibility: %s", subject, compatibility)
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404 or e.response.status_code == 40408:
-                # Subject compatibility not set
-                logger.debug(f"Subject {subject} has no specific compatibility set")
-                return None
-            raise
+            if e.response.status_code != 404 and e.response.status_code != 40408:
+                raise
+            # Subject compatibility not set
+            logger.debug("Subject %s has no specific compatibility set", subject)
+            compatibility = None
+        self._config_cache[subject] = (time.monotonic(), compatibility)
+        return compatibility
 
     def set_subject_compatibility(self, subject: str, compatibility: str) -> Dict:
         """Set the compatibility level for a specific subject."""
         payload = {"compatibility": compatibility}
-        response = self.session.put(
-            self._get_url(f"/config/{subject}"),
-            json=payload,
-            headers={"Content-Type": "application/vnd.schemaregistry.v1+json"}
+        self._compat_cache.pop(subject, None)
+        self._config_cache.pop(subject, None)
+        response = self._request(
+            "PUT",
+            f"/config/{subject}",
+            json=payload
         )
         response.raise_for_status()
-        result = response.json()
+        result = _json_loads(response.content)
+        self._config_cache[subject] = (time.monotonic(), compatibility)
         logger.info(f"Set subject {subject} compatibility to {compatibility}")
         return result
 
+    def delete_subject_compatibility(self, subject: str) -> None:
+        """Remove a subject-level compatibility level so the global one applies."""
+        self._compat_cache.pop(subject, None)
+        self._config_cache.pop(subject, None)
+        response = self._request("DELETE", f"/config/{subject}")
+        if response.status_code != 404:
+            response.raise_for_status()
+        self._config_cache[subject] = (time.monotonic(), None)
+
     def register_schema(self, subject: str, schema: str, schema_type: str = "AVRO", schema_id: Optional[int] = None, version: Optional[int] = None) -> Dict:
         """Register a new schema version for a subject."""
-        payload = {
-            "schema": schema,
-            "schemaType": schema_type
-        }
+        if schema_id is None and version is None:
+            payload = _schema_payload(schema, schema_type)
+        else:
+            payload = {
+                "schema": schema,
+                "schemaType": schema_type
+            }
         
         # Add schema ID if provided (for IMPORT mode)
         if schema_id is not None:
             payload["id"] = schema_id
-            logger.debug(f"Including ID {schema_id} in payload")
+            logger.debug("Including ID %s in payload", schema_id)
             
         # Add version if provided (for IMPORT mode)
         if version is not None:
             payload["version"] = version
-            logger.debug(f"Including version {version} in payload")
+            logger.debug("Including version %s in payload", version)
         
+        # Any registration attempt may add a version, so stop trusting the
+        # cached schema list, lookups and compatibility results for this subject
+        self._schema_cache.pop(subject, None)
+        self._compat_cache.pop(subject, None)
+        self._exists_cache.pop(subject, None)
+        self._disk_cache.pop(subject, None)
         try:
-            response = self.session.post(
-                self._get_url(f"/subjects/{subject}/versions"),
+            response = self._request(
+                "POST",
+                f"/subjects/{subject}/versions",
                 json=payload
             )
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
+            self._subjects_cache = None
             logger.info(f"Registered new schema version for subject {subject}" + 
                        (f" with ID {schema_id}" if schema_id else "") +
                        (f" and version {version}" if version else ""))
@@ -268,19 +719,16 @@ class SchemaRegistryClient:
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 409:
                 # Conflict - check if the schema already exists
-                logger.debug(f"Got 409 conflict for {subject}, checking if schema already exists...")
+                logger.debug("Got 409 conflict for %s, checking if schema already exists...", subject)
                 try:
                     # Check if this exact schema already exists (without version/id)
-                    check_payload = {
-                        "schema": schema,
-                        "schemaType": schema_type
-                    }
-                    response = self.session.post(
-                        self._get_url(f"/subjects/{subject}"),
-                        json=check_payload
+                    response = self._request(
+                        "POST",
+                        f"/subjects/{subject}",
+                        json=_schema_payload(schema, schema_type)
                     )
                     if response.status_code == 200:
-                        result = response.json()
+                        result = _json_loads(response.content)
                         logger.info(f"Schema already exists for subject {subject} with ID {result.get('id')}")
                         return result
                 except:
@@ -289,52 +737,67 @@ class SchemaRegistryClient:
                 raise
             elif e.response.status_code == 422:
                 # Try without ID/version if we get a 422 error
-                if (schema_id is not None or version is not None) and ("id" in payload or "version" in payload):
+                if schema_id is not None or version is not None:
                     logger.warning(f"Failed to register with ID/version, retrying without: {e}")
-                    retry_payload = {
-                        "schema": schema,
-                        "schemaType": schema_type
-                    }
-                    response = self.session.post(
-                        self._get_url(f"/subjects/{subject}/versions"),
-                        json=retry_payload
+                    response = self._request(
+                        "POST",
+                        f"/subjects/{subject}/versions",
+                        json=_schema_payload(schema, schema_type)
                     )
                     response.raise_for_status()
-                    result = response.json()
+                    result = _json_loads(response.content)
+                    self._subjects_cache = None
                     logger.info(f"Registered new schema version for subject {subject} (without ID/version preservation)")
                     return result
             raise
 
     def check_schema_exists(self, subject: str, schema: str, schema_type: str = "AVRO") -> Optional[Dict]:
-        """Check if a schema already exists for a subject and return its info."""
+        """Check if a schema already exists for a subject and return its info.
+
+        Definite answers (found or 404) are cached per subject until this
+        client registers to or deletes it.
+        """
+        key = (schema_type, _schema_fingerprint(schema))
+        subject_cache = self._exists_cache.get(subject)
+        if subject_cache is not None and key in subject_cache:
+            return subject_cache[key]
         try:
-            payload = {
-                "schema": schema,
-                "schemaType": schema_type
-            }
-            response = self.session.post(
-                self._get_url(f"/subjects/{subject}"),
-                json=payload
+            response = self._request(
+                "POST",
+                f"/subjects/{subject}",
+                json=_schema_payload(schema, schema_type)
             )
-            if response.status_code == 200:
-                return response.json()
-            return None
         except requests.exceptions.RequestException:
             return None
+        if response.status_code == 200:
+            existing = _json_loads(response.content)
+        elif response.status_code == 404:
+            existing = None
+        else:
+            return None
+        self._exists_cache.setdefault(subject, {})[key] = existing
+        return existing
 
     def check_schema_compatibility(self, subject: str, schema: str, schema_type: str = "AVRO", version: str = "latest") -> bool:
-        """Check if a schema is compatible with a specific version."""
-        payload = {
-            "schema": schema,
-            "schemaType": schema_type
-        }
-        response = self.session.post(
-            self._get_url(f"/compatibility/subjects/{subject}/versions/{version}"),
-            json=payload
+        """Check if a schema is compatible with a specific version.
+
+        Results are cached per subject until this client registers to it,
+        deletes it or changes its compatibility level.
+        """
+        key = (schema_type, _schema_fingerprint(schema), str(version))
+        subject_cache = self._compat_cache.get(subject)
+        if subject_cache is not None and key in subject_cache:
+            return subject_cache[key]
+        response = self._request(
+            "POST",
+            f"/compatibility/subjects/{subject}/versions/{version}",
+            json=_schema_payload(schema, schema_type)
         )
         response.raise_for_status()
-        result = response.json()
-        return result.get("is_compatible", False)
+        result = _json_loads(response.content)
+        is_compatible = result.get("is_compatible", False)
+        self._compat_cache.setdefault(subject, {})[key] = is_compatible
+        return is_compatible
 
 def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, List[str]]:
     """Compare schemas between source and destination registries."""
@@ -350,20 +813,36 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
         'version_sequence': {}
     }
 
-    # Get all unique schema IDs
-    source_ids = set()
-    dest_ids = set()
+    # Index both registries by subject and version number so lookups below
+    # are O(1) instead of scanning each subject's version list
+    source_index = {subject: {v['version']: v for v in versions} for subject, versions in source_schemas.items()}
+    dest_index = {subject: {v['version']: v for v in versions} for subject, versions in dest_schemas.items()}
+    # Map destination IDs to (schema fingerprint, subject, version) so ID
+    # collisions are found with one lookup per source version
+    dest_id_index = {
+        v['id']: (_record_fingerprint(v), subject, v['version'])
+        for subject, versions in dest_schemas.items()
+        for v in versions
+    }
+    # Bind the result lists once; the per-version loop below appends to them
+    # for every schema in the source registry
+    source_only = comparison['source_only']
+    id_differences = comparison['id_differences']
+    version_differences = comparison['version_differences']
+    schema_differences = comparison['schema_differences']
     
     # Check source schemas
     for subject, versions in source_schemas.items():
+        source_versions = sorted(source_index[subject])
+        dest_subject_index = dest_index.get(subject)
+        
         # Track version sequence for this subject
         comparison['version_sequence'][subject] = {
-            'source_versions': sorted([v['version'] for v in versions]),
-            'dest_versions': sorted([v['version'] for v in dest_schemas.get(subject, [])]) if subject in dest_schemas else []
+            'source_versions': source_versions,
+            'dest_versions': sorted(dest_subject_index) if dest_subject_index is not None else []
         }
         
         # Check for version gaps in source
-        source_versions = sorted([v['version'] for v in versions])
         if source_versions:
             expected_sequence = list(range(1, max(source_versions) + 1))
             if source_versions != expected_sequence:
@@ -376,11 +855,24 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                 })
         
         for version in versions:
-            source_ids.add(version['id'])
-            
+            fingerprint = _record_fingerprint(version)
+            # Check for ID collisions - same ID but different schema content
+            dest_info = dest_id_index.get(version['id'])
+            if dest_info is not None:
+                dest_fingerprint, dest_subject, dest_version = dest_info
+                if fingerprint != dest_fingerprint:
+                    collisions.append({
+                        'subject': subject,
+                        'version': version['version'],
+                        'id': version['id'],
+                        'dest_subject': dest_subject,
+                        'dest_version': dest_version,
+                        'details': f"ID {version['id']} used by different schemas in source ({subject} v{version['version']}) and destination ({dest_subject} v{dest_version})"
+                    })
+
             # Check if subject exists in destination
-            if subject not in dest_schemas:
-                comparison['source_only'].append({
+            if dest_subject_index is None:
+                source_only.append({
                     'subject': subject,
                     'version': version['version'],
                     'id': version['id']
@@ -388,11 +880,10 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                 continue
             
             # Check if version exists in destination
-            dest_versions = dest_schemas[subject]
-            dest_version = next((v for v in dest_versions if v['version'] == version['version']), None)
+            dest_version = dest_subject_index.get(version['version'])
             
-            if not dest_version:
-                comparison['version_differences'].append({
+            if dest_version is None:
+                version_differences.append({
                     'subject': subject,
                     'version': version['version'],
                     'source_id': version['id'],
@@ -401,8 +892,8 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                 })
             else:
                 # Check schema content
-                if version['schema'] != dest_version['schema']:
-                    comparison['schema_differences'].append({
+                if fingerprint != _record_fingerprint(dest_version):
+                    schema_differences.append({
                         'subject': subject,
                         'version': version['version'],
                         'source_id': version['id'],
@@ -412,7 +903,7 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                 
                 # Check ID differences
                 if version['id'] != dest_version['id']:
-                    comparison['id_differences'].append({
+                    id_differences.append({
                         'subject': subject,
                         'version': version['version'],
                         'source_id': version['id'],
@@ -423,7 +914,7 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
     # Check destination schemas for items not in source
     for subject, versions in dest_schemas.items():
         # Check for version gaps in destination
-        dest_versions = sorted([v['version'] for v in versions])
+        dest_versions = sorted(dest_index[subject])
         if dest_versions:
             expected_sequence = list(range(1, max(dest_versions) + 1))
             if dest_versions != expected_sequence:
@@ -435,11 +926,10 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                     'missing_versions': list(set(expected_sequence) - set(dest_versions))
                 })
         
+        source_subject_index = source_index.get(subject)
         for version in versions:
-            dest_ids.add(version['id'])
-            
             # Check if subject exists in source
-            if subject not in source_schemas:
+            if source_subject_index is None:
                 comparison['dest_only'].append({
                     'subject': subject,
                     'version': version['version'],
@@ -448,11 +938,8 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                 continue
             
             # Check if version exists in source
-            source_versions = source_schemas[subject]
-            source_version = next((v for v in source_versions if v['version'] == version['version']), None)
-            
-            if not source_version:
-                comparison['version_differences'].append({
+            if version['version'] not in source_subject_index:
+                version_differences.append({
                     'subject': subject,
                     'version': version['version'],
                     'dest_id': version['id'],
@@ -461,62 +948,35 @@ def compare_schemas(source_schemas: Dict, dest_schemas: Dict) -> Tuple[Dict, Lis
                 })
 
     # Find common subjects
-    common_subjects = set(source_schemas.keys()) & set(dest_schemas.keys())
+    common_subjects = source_index.keys() & dest_index.keys()
     comparison['common'] = list(common_subjects)
 
-    # Build a map of destination IDs to their schemas for collision detection
-    dest_id_to_schema = {}
-    for subject, versions in dest_schemas.items():
-        for version in versions:
-            dest_id_to_schema[version['id']] = {
-                'schema': version['schema'],
-                'subject': subject,
-                'version': version['version']
-            }
-
-    # Check for ID collisions - same ID but different schema content
-    for subject, versions in source_schemas.items():
-        for version in versions:
-            source_id = version['id']
-            source_schema = version['schema']
-            
-            # Check if this ID exists in destination
-            if source_id in dest_id_to_schema:
-                dest_info = dest_id_to_schema[source_id]
-                # Only flag as collision if the schemas are different
-                if source_schema != dest_info['schema']:
-                    collisions.append({
-                        'subject': subject,
-                        'version': version['version'],
-                        'id': source_id,
-                        'dest_subject': dest_info['subject'],
-                        'dest_version': dest_info['version'],
-                        'details': f"ID {source_id} used by different schemas in source ({subject} v{version['version']}) and destination ({dest_info['subject']} v{dest_info['version']})"
-                    })
-
     # Log detailed comparison results
     logger.info(f"Comparison complete:")
     logger.info(f"- Common subjects: {len(comparison['common'])}")
-    logger.info(f"- Source-only subjects: {len(comparison['source_only'])}")
-    logger.info(f"- Destination-only subjects: {len(comparison['dest_only'])}")
+    # source_only/dest_only hold one entry per version, so count subjects
+    logger.info(f"- Source-only subjects: {len(source_index.keys() - dest_index.keys())}")
+    logger.info(f"- Destination-only subjects: {len(dest_index.keys() - source_index.keys())}")
     logger.info(f"- Version differences: {len(comparison['version_differences'])}")
     logger.info(f"- Schema differences: {len(comparison['schema_differences'])}")
     logger.info(f"- ID differences: {len(comparison['id_differences'])}")
     logger.info(f"- Version gaps: {len(comparison['version_gaps'])}")
     
-    # Log version gaps details
-    if comparison['version_gaps']:
-        logger.warning("\nVersion gaps detected:")
+    # Log version gaps details, one record per category rather than per item
+    if comparison['version_gaps'] and logger.isEnabledFor(logging.WARNING):
+        lines = ["\nVersion gaps detected:"]
         for gap in comparison['version_gaps']:
-            logger.warning(f"Subject: {gap['subject']} ({gap['type']})")
-            logger.warning(f"  Actual versions: {gap['actual_versions']}")
-            logger.warning(f"  Expected versions: {gap['expected_versions']}")
-            logger.warning(f"  Missing versions: {gap['missing_versions']}")
+            lines.append(f"Subject: {gap['subject']} ({gap['type']})")
+            lines.append(f"  Actual versions: {gap['actual_versions']}")
+            lines.append(f"  Expected versions: {gap['expected_versions']}")
+            lines.append(f"  Missing versions: {gap['missing_versions']}")
+        logger.warning("\n".join(lines))
     
     if collisions:
-        logger.warning(f"\nFound {len(collisions)} ID collisions")
-        for collision in collisions:
-            logger.warning(f"  {collision['details']}")
+        if logger.isEnabledFor(logging.WARNING):
+            lines = [f"\nFound {len(collisions)} ID collisions"]
+            lines.extend(f"  {collision['details']}" for collision in collisions)
+            logger.warning("\n".join(lines))
     else:
         logger.info("\nNo ID collisions found")
 
@@ -527,9 +987,16 @@ def migrate_schemas(
         dest_client: SchemaRegistryClient, 
         dry_run: bool = True, 
         preserve_ids: bool = False,
-        auto_handle_compatibility: bool = True
+        auto_handle_compatibility: bool = True,
+        source_schemas: Optional[Dict[str, List[Dict]]] = None,
+        dest_schemas: Optional[Dict[str, List[Dict]]] = None
     ) -> Dict[str, List[Dict]]:
-    """Migrate schemas from source to destination registry."""
+    """Migrate schemas from source to destination registry.
+
+    ``source_schemas`` and ``dest_schemas`` may be passed in when the caller
+    already holds a current snapshot from get_all_schemas; otherwise they are
+    fetched here.
+    """
     migration_results = {
         'successful': [],
         'failed': [],
@@ -537,8 +1004,10 @@ def migrate_schemas(
     }
 
     # Get schemas from both registries
-    source_schemas = source_client.get_all_schemas()
-    dest_schemas = dest_client.get_all_schemas()
+    if source_schemas is None:
+        source_schemas = source_client.get_all_schemas()
+    if dest_schemas is None:
+        dest_schemas = dest_client.get_all_schemas()
 
     # Check if we should automatically handle compatibility issues
     auto_handle_compatibility = os.getenv('AUTO_HANDLE_COMPATIBILITY', 'true').lower() == 'true'
@@ -546,13 +1015,18 @@ def migrate_schemas(
     # Track subjects that need compatibility disabled
     subjects_needing_compatibility_disabled = set()
 
-    # Process each subject in source registry
-    for subject, versions in source_schemas.items():
+    # Index destination schema fingerprints per subject for O(1) existence checks
+    dest_fingerprints = {subject: {_record_fingerprint(v) for v in versions} for subject, versions in dest_schemas.items()}
+
+    # Destination global compatibility level, looked up at most once for
+    # dry-run compatibility checks
+    dest_global_compatibility = None
+
+    def migrate_subject_versions(subject: str, versions: List[Dict], migration_results: Dict[str, List[Dict]]) -> None:
+        """Migrate one subject's versions in order, adding their results to ``migration_results``."""
+        nonlocal dest_global_compatibility
         logger.info(f"Processing subject: {subject}")
         
-        # Sort versions to ensure we migrate in order
-        versions.sort(key=lambda x: x['version'])
-        
         # Check if we need to preserve IDs for this subject
         subject_preserve_ids = preserve_ids
         subject_import_mode_set = False
@@ -579,17 +1053,43 @@ def migrate_schemas(
                 logger.warning(f"Subject {subject} already has schemas, cannot preserve IDs")
                 subject_preserve_ids = False
         
-        # Process all versions for this subject
-        for version_info in versions:
-            version = version_info['version']
-            schema = version_info['schema']
-            schema_id = version_info['id'] if subject_preserve_ids else None
-            schema_type = version_info.get('schemaType', 'AVRO')
+        # In a dry run, subjects whose effective compatibility is NONE accept
+        # any schema, so their versions don't need a compatibility check each.
+        # If the level can't be read, every version is checked as usual.
+        subject_compatibility = None
+        if dry_run and dest_schemas.get(subject):
+            try:
+                subject_compatibility = dest_client.get_subject_compatibility(subject)
+                if subject_compatibility is None:
+                    if dest_global_compatibility is None:
+                        dest_global_compatibility = dest_client.get_global_compatibility()
+                    subject_compatibility = dest_global_compatibility
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Could not get compatibility for {subject}, checking each version: {e}")
+                subject_compatibility = None
+        
+        # Mode the subject had before it was switched to READWRITE for
+        # registration; it is restored once after all versions are processed
+        subject_writable_from_mode = None
+        
+        # A subject that was empty in the destination only holds what this run
+        # registers, so the registry lookup below is needed only for schemas
+        # matching one of those
+        subject_was_empty = not dest_schemas.get(subject)
+        registered_fingerprints = set()
+        
+        # Process all versions for this subject. Mode changes are undone in the
+        # finally block even if an unexpected error ends the loop early
+        try:
+            for version_info in versions:
+                version = version_info['version']
+                schema = version_info['schema']
+                schema_id = version_info['id'] if subject_preserve_ids else None
+                schema_type = version_info.get('schemaType', 'AVRO')
+                fingerprint = _record_fingerprint(version_info)
             
-            # Check if schema already exists in destination
-            if subject in dest_schemas:
-                dest_versions = dest_schemas[subject]
-                if any(v['schema'] == schema for v in dest_versions):
+                # Check if schema already exists in destination
+                if fingerprint in dest_fingerprints.get(subject, ()):
                     logger.info(f"Skipping {subject} version {version} - schema already exists")
                     migration_results['skipped'].append({
                         'subject': subject,
@@ -598,33 +1098,34 @@ def migrate_schemas(
                     })
                     continue
 
-            try:
-                if not dry_run:
-                    # First check if this exact schema already exists
-                    existing_schema = dest_client.check_schema_exists(subject, schema, schema_type)
-                    if existing_schema:
-                        logger.info(f"Schema already exists for {subject} with ID {existing_schema.get('id')}, skipping")
-                        migration_results['skipped'].append({
-                            'subject': subject,
-                            'version': version,
-                            'existing_id': existing_schema.get('id'),
-                            'reason': 'Exact schema already registered'
-                        })
-                        continue
+                try:
+                    if not dry_run:
+                        # First check if this exact schema already exists
+                        existing_schema = None
+                        if not subject_was_empty or fingerprint in registered_fingerprints:
+                            existing_schema = dest_client.check_schema_exists(subject, schema, schema_type)
+                        if existing_schema:
+                            logger.info(f"Schema already exists for {subject} with ID {existing_schema.get('id')}, skipping")
+                            migration_results['skipped'].append({
+                                'subject': subject,
+                                'version': version,
+                                'existing_id': existing_schema.get('id'),
+                                'reason': 'Exact schema already registered'
+                            })
+                            continue
                     
-                    # Check and update subject mode if needed (only if not in IMPORT mode already)
-                    if not subject_import_mode_set:
-                        subject_mode = dest_client.get_subject_mode(subject)
-                        mode_changed = False
+                        # Check and update subject mode if needed (only if not in IMPORT mode already)
+                        if not subject_import_mode_set:
+                            if subject_writable_from_mode is None:
+                                subject_mode = dest_client.get_subject_mode(subject)
+                                if subject_mode != 'READWRITE':
+                                    logger.info(f"Subject {subject} is in {subject_mode} mode, changing to READWRITE")
+                                    dest_client.set_subject_mode(subject, 'READWRITE')
+                                    subject_writable_from_mode = subject_mode
                         
-                        if subject_mode != 'READWRITE':
-                            logger.info(f"Subject {subject} is in {subject_mode} mode, changing to READWRITE")
-                            dest_client.set_subject_mode(subject, 'READWRITE')
-                            mode_changed = True
-                        
-                        try:
                             # Register schema in destination with correct schema type
                             result = dest_client.register_schema(subject, schema, schema_type=schema_type, schema_id=schema_id, version=version)
+                            registered_fingerprints.add(fingerprint)
                             logger.info(f"Successfully migrated {subject} version {version} (type: {schema_type})")
                             migration_results['successful'].append({
                                 'subject': subject,
@@ -632,100 +1133,162 @@ def migrate_schemas(
                                 'new_id': result.get('id'),
                                 'original_id': version_info['id']
                             })
-                        finally:
-                            # Restore original mode if it was changed
-                            if mode_changed:
-                                logger.info(f"Restoring subject {subject} mode to {subject_mode}")
-                                dest_client.set_subject_mode(subject, subject_mode)
-                    else:
-                        # We're in IMPORT mode, just register with ID
-                        result = dest_client.register_schema(subject, schema, schema_type=schema_type, schema_id=schema_id, version=version)
-                        logger.info(f"Successfully migrated {subject} version {version} with ID {schema_id} (type: {schema_type})")
-                        migration_results['successful'].append({
-                            'subject': subject,
-                            'version': version,
-                            'new_id': result.get('id'),
-                            'original_id': version_info['id']
-                        })
-                else:
-                    # In dry run mode, just check compatibility
-                    is_compatible = dest_client.check_schema_compatibility(subject, schema, schema_type=schema_type)
-                    if is_compatible:
-                        logger.info(f"[DRY RUN] Would migrate {subject} version {version} - compatible")
-                        migration_results['successful'].append({
-                            'subject': subject,
-                            'version': version,
-                            'reason': 'Compatible in dry run'
-                        })
+                        else:
+                            # We're in IMPORT mode, just register with ID
+                            result = dest_client.register_schema(subject, schema, schema_type=schema_type, schema_id=schema_id, version=version)
+                            registered_fingerprints.add(fingerprint)
+                            logger.info(f"Successfully migrated {subject} version {version} with ID {schema_id} (type: {schema_type})")
+                            migration_results['successful'].append({
+                                'subject': subject,
+                                'version': version,
+                                'new_id': result.get('id'),
+                                'original_id': version_info['id']
+                            })
                     else:
-                        logger.warning(f"[DRY RUN] Would fail to migrate {subject} version {version} - incompatible")
-                        migration_results['failed'].append({
-                            'subject': subject,
-                            'version': version,
-                            'reason': 'Incompatible schema'
-                        })
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 409:
-                    # Conflict - might be due to compatibility issues
-                    logger.warning(f"Conflict for {subject} version {version}, checking if it's a compatibility issue...")
+                        # A subject that doesn't exist in the destination has nothing to
+                        # be incompatible with, so there is no need to ask the registry
+                        if not dest_schemas.get(subject):
+                            logger.info(f"[DRY RUN] Would migrate {subject} version {version} - new subject")
+                            migration_results['successful'].append({
+                                'subject': subject,
+                                'version': version,
+                                'reason': 'New subject in dry run'
+                            })
+                            continue
                     
-                    # Check if we should try with compatibility disabled
-                    if not dry_run and auto_handle_compatibility and subject not in subjects_needing_compatibility_disabled:
-                        subjects_needing_compatibility_disabled.add(subject)
-                        logger.info(f"Will retry {subject} with compatibility disabled")
-                        migration_results['failed'].append({
-                            'subject': subject,
-                            'version': version,
-                            'reason': '409 Conflict - will retry with compatibility disabled',
-                            'retry_with_compatibility_disabled': True
-                        })
-                    else:
-                        # Get the latest version to provide more context
-                        latest_version = dest_client.get_latest_version(subject)
-                        logger.error(f"409 Conflict for {subject}: schema content differs from existing versions. Latest version in destination: {latest_version}")
+                        # In dry run mode, just check compatibility
+                        if subject_compatibility == 'NONE':
+                            is_compatible = True
+                        else:
+                            is_compatible = dest_client.check_schema_compatibility(subject, schema, schema_type=schema_type)
+                        if is_compatible:
+                            logger.info(f"[DRY RUN] Would migrate {subject} version {version} - compatible")
+                            migration_results['successful'].append({
+                                'subject': subject,
+                                'version': version,
+                                'reason': 'Compatible in dry run'
+                            })
+                        else:
+                            logger.warning(f"[DRY RUN] Would fail to migrate {subject} version {version} - incompatible")
+                            migration_results['failed'].append({
+                                'subject': subject,
+                                'version': version,
+                                'version_info': version_info,
+                                'reason': 'Incompatible schema'
+                            })
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code == 409:
+                        # Conflict - might be due to compatibility issues
+                        logger.warning(f"Conflict for {subject} version {version}, checking if it's a compatibility issue...")
+                    
+                        # Check if we should try with compatibility disabled
+                        if not dry_run and auto_handle_compatibility and subject not in subjects_needing_compatibility_disabled:
+                            subjects_needing_compatibility_disabled.add(subject)
+                            logger.info(f"Will retry {subject} with compatibility disabled")
+                            migration_results['failed'].append({
+                                'subject': subject,
+                                'version': version,
+                                'version_info': version_info,
+                                'reason': '409 Conflict - will retry with compatibility disabled',
+                                'retry_with_compatibility_disabled': True
+                            })
+                        else:
+                            # Get the latest version to provide more context
+                            latest_version = dest_client.get_latest_version(subject)
+                            logger.error(f"409 Conflict for {subject}: schema content differs from existing versions. Latest version in destination: {latest_version}")
                         
-                        # Use enhanced error reporting
-                        try:
-                            comparison = compare_schema_versions(source_client, dest_client, subject, version)
-                            if comparison['differences']:
-                                logger.error(f"Schema differences for {subject} version {version}:")
-                                for diff in comparison['differences']:
-                                    logger.error(f"  - {diff}")
-                        except Exception as comp_error:
-                            logger.debug(f"Could not compare schemas: {comp_error}")
+                            # Use enhanced error reporting
+                            try:
+                                comparison = compare_schema_versions(source_client, dest_client, subject, version)
+                                if comparison['differences']:
+                                    logger.error(f"Schema differences for {subject} version {version}:")
+                                    for diff in comparison['differences']:
+                                        logger.error(f"  - {diff}")
+                            except Exception as comp_error:
+                                logger.debug("Could not compare schemas: %s", comp_error)
                         
+                            migration_results['failed'].append({
+                                'subject': subject,
+                                'version': version,
+                                'version_info': version_info,
+                                'reason': f'409 Conflict: Different schema already exists (latest version: {latest_version})'
+                            })
+                    else:
+                        logger.error(f"Failed to migrate {subject} version {version}: {str(e)}")
                         migration_results['failed'].append({
                             'subject': subject,
                             'version': version,
-                            'reason': f'409 Conflict: Different schema already exists (latest version: {latest_version})'
+                            'version_info': version_info,
+                            'reason': str(e)
                         })
-                else:
+                except Exception as e:
                     logger.error(f"Failed to migrate {subject} version {version}: {str(e)}")
                     migration_results['failed'].append({
                         'subject': subject,
                         'version': version,
+                        'version_info': version_info,
                         'reason': str(e)
                     })
-            except Exception as e:
-                logger.error(f"Failed to migrate {subject} version {version}: {str(e)}")
-                migration_results['failed'].append({
-                    'subject': subject,
-                    'version': version,
-                    'reason': str(e)
-                })
-        
-        # After processing all versions for this subject, restore mode if needed
-        if subject_import_mode_set and subject_original_mode:
-            try:
-                logger.info(f"Restoring subject {subject} mode from IMPORT to {subject_original_mode}")
-                dest_client.set_subject_mode(subject, subject_original_mode)
-            except Exception as e:
-                logger.warning(f"Could not restore mode for {subject}: {e}")
+        finally:
+            # After processing all versions for this subject, restore mode if needed
+            if subject_writable_from_mode is not None:
+                try:
+                    logger.info(f"Restoring subject {subject} mode to {subject_writable_from_mode}")
+                    dest_client.set_subject_mode(subject, subject_writable_from_mode)
+                except Exception as e:
+                    logger.warning(f"Could not restore mode for {subject}: {e}")
+            if subject_import_mode_set and subject_original_mode:
+                try:
+                    logger.info(f"Restoring subject {subject} mode from IMPORT to {subject_original_mode}")
+                    dest_client.set_subject_mode(subject, subject_original_mode)
+                except Exception as e:
+                    logger.warning(f"Could not restore mode for {subject}: {e}")
+
+    def migrate_subject(subject: str, versions: List[Dict]) -> Dict[str, List[Dict]]:
+        """Migrate one subject's versions in order and return its results.
+
+        An unexpected error stops the subject early instead of aborting the
+        whole migration: it is logged and every version without a result yet
+        is reported as failed.
+        """
+        migration_results = {
+            'successful': [],
+            'failed': [],
+            'skipped': []
+        }
+        try:
+            migrate_subject_versions(subject, versions, migration_results)
+        except Exception as e:
+            logger.error(f"Failed to migrate subject {subject}: {str(e)}")
+            processed = {entry['version'] for entries in migration_results.values() for entry in entries}
+            for version_info in versions:
+                if version_info['version'] not in processed:
+                    migration_results['failed'].append({
+                        'subject': subject,
+                        'version': version_info['version'],
+                        'version_info': version_info,
+                        'reason': str(e)
+                    })
+        return migration_results
+
+    # Subjects are independent of each other, so they are migrated
+    # concurrently; each subject's versions are still registered in order
+    # (get_all_schemas returns them ascending). Results are merged in source
+    # subject order.
+    with ThreadPoolExecutor(max_workers=dest_client.max_workers) as executor:
+        for subject_results in executor.map(lambda item: migrate_subject(*item), source_schemas.items()):
+            for status, entries in subject_results.items():
+                migration_results[status].extend(entries)
 
     # Retry subjects that need compatibility disabled
     if not dry_run and subjects_needing_compatibility_disabled:
         logger.info(f"\nRetrying {len(subjects_needing_compatibility_disabled)} subjects with compatibility disabled...")
         
+        # Index results by (subject, version) so each retried version is
+        # looked up and moved out of the failed list in O(1)
+        successful_keys = {(m['subject'], m['version']) for m in migration_results['successful']}
+        failed_by_key = {(f['subject'], f['version']): f for f in migration_results['failed']}
+        
         for subject in subjects_needing_compatibility_disabled:
             # Store original settings
             original_mode = None
@@ -784,15 +1347,15 @@ def migrate_schemas(
                         else:
                             compatibility_was_global = False
                         
-                        logger.info(f"Setting {subject} compatibility to NONE (was {original_compatibility})")
-                        dest_client.set_subject_compatibility(subject, 'NONE')
-                        compatibility_changed = True
+                        if original_compatibility != 'NONE':
+                            logger.info(f"Setting {subject} compatibility to NONE (was {original_compatibility})")
+                            dest_client.set_subject_compatibility(subject, 'NONE')
+                            compatibility_changed = True
                     except Exception as e:
                         logger.warning(f"Could not set compatibility for {subject}: {e}")
                 
-                # Retry migration for this subject
+                # Retry migration for this subject (versions are already in order)
                 subject_versions = source_schemas[subject]
-                subject_versions.sort(key=lambda x: x['version'])
                 
                 for version_info in subject_versions:
                     version = version_info['version']
@@ -801,7 +1364,7 @@ def migrate_schemas(
                     schema_type = version_info.get('schemaType', 'AVRO')
                     
                     # Skip if already successful
-                    if any(m['subject'] == subject and m['version'] == version for m in migration_results['successful']):
+                    if (subject, version) in successful_keys:
                         continue
                     
                     try:
@@ -810,8 +1373,7 @@ def migrate_schemas(
                         if existing_schema:
                             logger.info(f"Schema already exists for {subject} version {version}, skipping")
                             # Remove from failed and add to skipped
-                            migration_results['failed'] = [f for f in migration_results['failed'] 
-                                                         if not (f['subject'] == subject and f['version'] == version)]
+                            failed_by_key.pop((subject, version), None)
                             migration_results['skipped'].append({
                                 'subject': subject,
                                 'version': version,
@@ -827,8 +1389,8 @@ def migrate_schemas(
                                    (f" and version {version}" if version else ""))
                         
                         # Remove from failed and add to successful
-                        migration_results['failed'] = [f for f in migration_results['failed'] 
-                                                     if not (f['subject'] == subject and f['version'] == version)]
+                        failed_by_key.pop((subject, version), None)
+                        successful_keys.add((subject, version))
                         migration_results['successful'].append({
                             'subject': subject,
                             'version': version,
@@ -839,10 +1401,9 @@ def migrate_schemas(
                     except Exception as e:
                         logger.error(f"Failed to migrate {subject} version {version} even with compatibility disabled: {e}")
                         # Update the failure reason
-                        for failure in migration_results['failed']:
-                            if failure['subject'] == subject and failure['version'] == version:
-                                failure['reason'] = f"Failed even with compatibility disabled: {str(e)}"
-                                break
+                        failure = failed_by_key.get((subject, version))
+                        if failure is not None:
+                            failure['reason'] = f"Failed even with compatibility disabled: {str(e)}"
                 
             finally:
                 # Restore original settings
@@ -857,7 +1418,7 @@ def migrate_schemas(
                     try:
                         if compatibility_was_global:
                             # Delete subject-level compatibility to revert to global
-                            response = dest_client.session.delete(dest_client._get_url(f"/config/{subject}"))
+                            dest_client.delete_subject_compatibility(subject)
                             logger.info(f"Removed subject-level compatibility for {subject}, reverting to global")
                         else:
                             # Restore subject-level compatibility
@@ -866,6 +1427,8 @@ def migrate_schemas(
                     except Exception as e:
                         logger.warning(f"Could not restore compatibility for {subject}: {e}")
 
+        migration_results['failed'] = list(failed_by_key.values())
+
     return migration_results
 
 def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: SchemaRegistryClient,
@@ -879,12 +1442,6 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
     
     logger.info(f"\nRetrying {len(failed_migrations)} failed migrations...")
     
-    # Get source schemas for retry
-    source_schemas = source_client.get_all_schemas()
-    
-    # Get destination schemas to check what already exists
-    dest_schemas = dest_client.get_all_schemas()
-    
     # Check if we should automatically handle compatibility issues
     auto_handle_compatibility = os.getenv('AUTO_HANDLE_COMPATIBILITY', 'true').lower() == 'true'
     
@@ -896,8 +1453,13 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
             failed_by_subject[subject] = []
         failed_by_subject[subject].append(failed)
     
-    # Process each subject
-    for subject, subject_failures in failed_by_subject.items():
+    def retry_subject(subject: str, subject_failures: List[Dict]) -> Dict[str, List[Dict]]:
+        """Retry one subject's failed versions, returning its own results."""
+        results = {
+            'successful': [],
+            'failed': [],
+            'skipped': []
+        }
         logger.info(f"\nRetrying {len(subject_failures)} failed versions for subject: {subject}")
         
         # Store original settings
@@ -911,13 +1473,17 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
         subject_import_mode_set = False
         
         # Sort failures by version to maintain order
-        subject_failures.sort(key=lambda x: x['version'])
+        subject_failures.sort(key=itemgetter('version'))
         
         try:
+            # Only this subject's destination versions are needed to tell
+            # which failed versions already exist
+            dest_subject_schemas = dest_client.get_subject_schemas(subject)
+            dest_fingerprints = {_record_fingerprint(v) for v in dest_subject_schemas}
+            
             # If preserving IDs, check if subject is empty and set IMPORT mode once
             if preserve_ids:
                 # Check if subject is empty in destination
-                dest_subject_schemas = dest_client.get_subject_schemas(subject)
                 if not dest_subject_schemas:
                     # Subject is empty, we can set IMPORT mode
                     try:
@@ -960,9 +1526,10 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
                     else:
                         compatibility_was_global = False
                     
-                    logger.info(f"Setting {subject} compatibility to NONE (was {original_compatibility})")
-                    dest_client.set_subject_compatibility(subject, 'NONE')
-                    compatibility_changed = True
+                    if original_compatibility != 'NONE':
+                        logger.info(f"Setting {subject} compatibility to NONE (was {original_compatibility})")
+                        dest_client.set_subject_compatibility(subject, 'NONE')
+                        compatibility_changed = True
                 except Exception as e:
                     logger.warning(f"Could not set compatibility for {subject}: {e}")
             
@@ -970,48 +1537,44 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
             for failed in subject_failures:
                 version = failed['version']
                 
-                # Find the schema in source
-                if subject not in source_schemas:
-                    logger.error(f"Subject {subject} not found in source registry")
-                    retry_results['failed'].append({
-                        'subject': subject,
-                        'version': version,
-                        'reason': 'Subject not found in source'
-                    })
-                    continue
-                
-                version_info = next((v for v in source_schemas[subject] if v['version'] == version), None)
-                if not version_info:
-                    logger.error(f"Version {version} not found for subject {subject}")
-                    retry_results['failed'].append({
-                        'subject': subject,
-                        'version': version,
-                        'reason': 'Version not found in source'
-                    })
-                    continue
+                # Failures recorded by migrate_schemas carry the source schema;
+                # anything else is looked up in the source registry
+                version_info = failed.get('version_info')
+                if version_info is None:
+                    try:
+                        version_info = _schema_record(version, source_client.get_schema(subject, version))
+                    except requests.exceptions.HTTPError as e:
+                        if e.response.status_code != 404:
+                            raise
+                        logger.error(f"Version {version} not found for subject {subject}")
+                        results['failed'].append({
+                            'subject': subject,
+                            'version': version,
+                            'reason': 'Version not found in source'
+                        })
+                        continue
                 
                 schema = version_info['schema']
                 schema_id = version_info['id'] if subject_preserve_ids else None
                 schema_type = version_info.get('schemaType', 'AVRO')
                 
                 # Check if schema already exists in destination
-                if subject in dest_schemas:
-                    dest_versions = dest_schemas[subject]
-                    if any(v['schema'] == schema for v in dest_versions):
-                        logger.info(f"Skipping {subject} version {version} - schema already exists in destination")
-                        retry_results['skipped'].append({
-                            'subject': subject,
-                            'version': version,
-                            'reason': 'Schema already exists in destination'
-                        })
-                        continue
+                fingerprint = _record_fingerprint(version_info)
+                if fingerprint in dest_fingerprints:
+                    logger.info(f"Skipping {subject} version {version} - schema already exists in destination")
+                    results['skipped'].append({
+                        'subject': subject,
+                        'version': version,
+                        'reason': 'Schema already exists in destination'
+                    })
+                    continue
                 
                 try:
                     # First check if this exact schema already exists
                     existing_schema = dest_client.check_schema_exists(subject, schema, schema_type)
                     if existing_schema:
                         logger.info(f"Schema already exists for {subject} with ID {existing_schema.get('id')}, marking as skipped")
-                        retry_results['skipped'].append({
+                        results['skipped'].append({
                             'subject': subject,
                             'version': version,
                             'existing_id': existing_schema.get('id'),
@@ -1024,7 +1587,7 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
                     logger.info(f"Successfully migrated {subject} version {version} on retry" + 
                                (f" with ID {schema_id}" if schema_id else "") +
                                (f" and version {version}" if version else ""))
-                    retry_results['successful'].append({
+                    results['successful'].append({
                         'subject': subject,
                         'version': version,
                         'new_id': result.get('id'),
@@ -1039,9 +1602,9 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
                         # Refresh destination schemas
                         try:
                             dest_subject_schemas = dest_client.get_subject_schemas(subject)
-                            if any(v['schema'] == schema for v in dest_subject_schemas):
+                            if any(_record_fingerprint(v) == fingerprint for v in dest_subject_schemas):
                                 logger.info(f"Schema already exists for {subject} version {version}, marking as skipped")
-                                retry_results['skipped'].append({
+                                results['skipped'].append({
                                     'subject': subject,
                                     'version': version,
                                     'reason': 'Schema already exists (409 conflict)'
@@ -1050,28 +1613,28 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
                                 # Get the latest version to provide more context
                                 latest_version = dest_client.get_latest_version(subject)
                                 logger.error(f"409 Conflict for {subject}: schema content differs. Latest version: {latest_version}")
-                                retry_results['failed'].append({
+                                results['failed'].append({
                                     'subject': subject,
                                     'version': version,
                                     'reason': f'409 Conflict: Different schema exists (latest: {latest_version})'
                                 })
                         except Exception as check_error:
                             logger.error(f"Failed to check existing schema: {check_error}")
-                            retry_results['failed'].append({
+                            results['failed'].append({
                                 'subject': subject,
                                 'version': version,
                                 'reason': f'409 Conflict and failed to verify: {str(e)}'
                             })
                     else:
                         logger.error(f"Failed to migrate {subject} version {version} on retry: {str(e)}")
-                        retry_results['failed'].append({
+                        results['failed'].append({
                             'subject': subject,
                             'version': version,
                             'reason': str(e)
                         })
                 except Exception as e:
                     logger.error(f"Failed to migrate {subject} version {version} on retry: {str(e)}")
-                    retry_results['failed'].append({
+                    results['failed'].append({
                         'subject': subject,
                         'version': version,
                         'reason': str(e)
@@ -1090,7 +1653,7 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
                 try:
                     if compatibility_was_global:
                         # Delete subject-level compatibility to revert to global
-                        response = dest_client.session.delete(dest_client._get_url(f"/config/{subject}"))
+                        dest_client.delete_subject_compatibility(subject)
                         logger.info(f"Removed subject-level compatibility for {subject}, reverting to global")
                     else:
                         # Restore subject-level compatibility
@@ -1098,6 +1661,16 @@ def retry_failed_migrations(source_client: SchemaRegistryClient, dest_client: Sc
                         logger.info(f"Restored {subject} compatibility to {original_compatibility}")
                 except Exception as e:
                     logger.warning(f"Could not restore compatibility for {subject}: {e}")
+
+        return results
+
+    # Subjects are retried concurrently, like in migrate_schemas; each
+    # subject's versions are still retried in order and results are merged in
+    # subject order
+    with ThreadPoolExecutor(max_workers=dest_client.max_workers) as executor:
+        for subject_results in executor.map(lambda item: retry_subject(*item), failed_by_subject.items()):
+            for status, entries in subject_results.items():
+                retry_results[status].extend(entries)
     
     return retry_results
 
@@ -1108,66 +1681,146 @@ def display_results(source_schemas: Dict, dest_schemas: Dict, comparison: Dict,
     logger.info(f"Source Registry: {len(source_schemas)} subjects")
     logger.info(f"Destination Registry: {len(dest_schemas)} subjects")
 
-    # Log comparison results
-    logger.info("\nSchema Comparison Results:")
-    for category, subjects in comparison.items():
-        if isinstance(subjects, list):
-            if subjects:
-                logger.info(f"\n{category}:")
-                for subject in subjects:
-                    logger.info(f"  - {subject}")
-        else:
-            logger.info(f"{category}: {subjects}")
+    # Log comparison results, one record per category rather than per item
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nSchema Comparison Results:")
+        for category, subjects in comparison.items():
+            if isinstance(subjects, list):
+                if subjects:
+                    logger.info("\n".join([f"\n{category}:"] + [f"  - {subject}" for subject in subjects]))
+            else:
+                logger.info(f"{category}: {subjects}")
 
     # Log ID collisions
     if collisions:
-        logger.warning("\nID Collisions Found:")
-        for collision in collisions:
-            logger.warning(
-                f"ID {collision['id']}: "
-                f"Source: {collision['subject']} v{collision['version']} <-> "
-                f"Dest: {collision['dest_subject']} v{collision['dest_version']}"
-            )
+        if logger.isEnabledFor(logging.WARNING):
+            lines = ["\nID Collisions Found:"]
+            for collision in collisions:
+                lines.append(
+                    f"ID {collision['id']}: "
+                    f"Source: {collision['subject']} v{collision['version']} <-> "
+                    f"Dest: {collision['dest_subject']} v{collision['dest_version']}"
+                )
+            logger.warning("\n".join(lines))
     else:
         logger.info("\nNo ID collisions found")
 
 def display_migration_results(results: Dict[str, List[Dict]]):
-    """Display migration results using logging."""
+    """Display migration results using logging.
+
+    Each category is emitted as a single multi-line log record so that large
+    migrations don't pay the logging overhead once per schema version.
+    """
     logger.info("\nMigration Results:")
     
     # Display successful migrations
-    if results['successful']:
-        logger.info("\nSuccessful Migrations:")
+    if results['successful'] and logger.isEnabledFor(logging.INFO):
+        lines = ["\nSuccessful Migrations:"]
         for migration in results['successful']:
-            logger.info(
+            lines.append(
                 f"Subject: {migration['subject']}, "
                 f"Version: {migration['version']}"
                 + (f", New ID: {migration['new_id']}" if 'new_id' in migration else "")
             )
+        logger.info("\n".join(lines))
     
     # Display failed migrations
-    if results['failed']:
-        logger.warning("\nFailed Migrations:")
+    if results['failed'] and logger.isEnabledFor(logging.WARNING):
+        lines = ["\nFailed Migrations:"]
         for migration in results['failed']:
-            logger.warning(
+            lines.append(
                 f"Subject: {migration['subject']}, "
                 f"Version: {migration['version']}, "
                 f"Reason: {migration['reason']}"
             )
+        logger.warning("\n".join(lines))
     
     # Display skipped migrations
-    if results['skipped']:
-        logger.info("\nSkipped Migrations:")
+    if results['skipped'] and logger.isEnabledFor(logging.INFO):
+        lines = ["\nSkipped Migrations:"]
         for migration in results['skipped']:
-            logger.info(
+            lines.append(
                 f"Subject: {migration['subject']}, "
                 f"Version: {migration['version']}, "
                 f"Reason: {migration['reason']}"
             )
+        logger.info("\n".join(lines))
+
+def _delete_subject(client: SchemaRegistryClient, subject: str, permanent: bool) -> str:
+    """Delete a single subject as part of a registry cleanup.
+    
+    A subject that cannot be permanently deleted (422) is soft deleted
+    instead. Returns 'deleted', 'not_found' if the subject was already gone
+    (404), or 'undeletable' if neither delete succeeded; any other failure
+    is logged and raised.
+    """
+    try:
+        # First check if subject is in read-only mode and change it if needed
+        try:
+            subject_mode = client.get_subject_mode(subject)
+            if subject_mode != 'READWRITE':
+                logger.info(f"Subject {subject} is in {subject_mode} mode, changing to READWRITE for deletion")
+                client.set_subject_mode(subject, 'READWRITE')
+        except Exception as e:
+            logger.debug("Could not check/change mode for %s: %s", subject, e)
+        
+        # The subject is about to disappear, so cached subject data is stale
+        client._invalidate_subject_cache(subject)
+
+        # Add permanent=true parameter for hard delete
+        path = f"/subjects/{subject}"
+        
+        if permanent:
+            # For permanent delete, we need to do soft delete first
+            try:
+                logger.debug("Performing soft delete for subject %s", subject)
+                response = client._request("DELETE", path)
+                response.raise_for_status()
+                logger.debug("Soft delete successful for subject %s", subject)
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code != 404:
+                    logger.debug("Soft delete failed with status %s: %s", e.response.status_code, e)
+            
+            # Now perform hard delete
+            path += "?permanent=true"
+            logger.debug("Performing hard delete for subject %s with path: %s", subject, path)
+        else:
+            logger.debug("Performing soft delete for subject %s with path: %s", subject, path)
+        
+        response = client._request("DELETE", path)
+        response.raise_for_status()
+        logger.info(f"Successfully {'permanently' if permanent else 'soft'} deleted subject {subject}")
+        return 'deleted'
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 404:
+            logger.warning(f"Subject {subject} not found (may have been already deleted)")
+            return 'not_found'
+        elif e.response.status_code == 422:
+            # 422 can occur when trying to permanently delete a subject that's in read-only mode
+            # or when the subject has special protections
+            logger.warning(f"Cannot permanently delete subject {subject} (may be protected or in read-only mode)")
+            # Try soft delete instead
+            try:
+                response = client._request("DELETE", f"/subjects/{subject}")
+                response.raise_for_status()
+                logger.info(f"Successfully soft deleted subject {subject}")
+                return 'deleted'
+            except:
+                logger.warning(f"Could not delete subject {subject}")
+            return 'undeletable'
+        logger.error(f"Failed to delete subject {subject}: {e}")
+        raise
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to delete subject {subject}: {e}")
+        raise
 
 def cleanup_registry(client: SchemaRegistryClient, permanent: bool = True) -> None:
     """Clean up the destination registry by deleting all subjects.
     
+    Subjects are deleted concurrently using up to ``client.max_workers``
+    threads. Every subject is attempted even if some deletions fail; the
+    failures are then reported together in a single RuntimeError.
+    
     Args:
         client: The Schema Registry client
         permanent: If True, permanently delete subjects (hard delete). If False, soft delete.
@@ -1177,62 +1830,25 @@ def cleanup_registry(client: SchemaRegistryClient, permanent: bool = True) -> No
         if not subjects:
             logger.info("No subjects found in registry, nothing to clean up")
             return
-            
-        for subject in subjects:
-            try:
-                # First check if subject is in read-only mode and change it if needed
+        
+        failed_subjects = []
+        with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+            futures = {
+                executor.submit(_delete_subject, client, subject, permanent): subject
+                for subject in subjects
+            }
+            for future in as_completed(futures):
                 try:
-                    subject_mode = client.get_subject_mode(subject)
-                    if subject_mode != 'READWRITE':
-                        logger.info(f"Subject {subject} is in {subject_mode} mode, changing to READWRITE for deletion")
-                        client.set_subject_mode(subject, 'READWRITE')
-                except Exception as e:
-                    logger.debug(f"Could not check/change mode for {subject}: {e}")
-                
-                # Add permanent=true parameter for hard delete
-                url = client._get_url(f"/subjects/{subject}")
-                
-                if permanent:
-                    # For permanent delete, we need to do soft delete first
-                    try:
-                        logger.debug(f"Performing soft delete for subject {subject}")
-                        response = client.session.delete(url)
-                        response.raise_for_status()
-                        logger.debug(f"Soft delete successful for subject {subject}")
-                    except requests.exceptions.HTTPError as e:
-                        if e.response.status_code != 404:
-                            logger.debug(f"Soft delete failed with status {e.response.status_code}: {e}")
-                    
-                    # Now perform hard delete
-                    url += "?permanent=true"
-                    logger.debug(f"Performing hard delete for subject {subject} with URL: {url}")
-                else:
-                    logger.debug(f"Performing soft delete for subject {subject} with URL: {url}")
-                
-                response = client.session.delete(url)
-                response.raise_for_status()
-                logger.info(f"Successfully {'permanently' if permanent else 'soft'} deleted subject {subject}")
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    logger.warning(f"Subject {subject} not found (may have been already deleted)")
-                    continue
-                elif e.response.status_code == 422:
-                    # 422 can occur when trying to permanently delete a subject that's in read-only mode
-                    # or when the subject has special protections
-                    logger.warning(f"Cannot permanently delete subject {subject} (may be protected or in read-only mode)")
-                    # Try soft delete instead
-                    try:
-                        response = client.session.delete(client._get_url(f"/subjects/{subject}"))
-                        response.raise_for_status()
-                        logger.info(f"Successfully soft deleted subject {subject}")
-                    except:
-                        logger.warning(f"Could not delete subject {subject}")
-                    continue
-                logger.error(f"Failed to delete subject {subject}: {e}")
-                raise
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to delete subject {subject}: {e}")
-                raise
+                    future.result()
+                except requests.exceptions.RequestException:
+                    # Already logged by _delete_subject
+                    failed_subjects.append(futures[future])
+        
+        if failed_subjects:
+            raise RuntimeError(
+                f"Failed to delete {len(failed_subjects)} of {len(subjects)} subjects: "
+                f"{', '.join(sorted(failed_subjects))}"
+            )
         logger.info(f"Successfully cleaned up destination registry ({'permanent' if permanent else 'soft'} delete)")
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to clean up destination registry: {e}")
@@ -1241,6 +1857,9 @@ def cleanup_registry(client: SchemaRegistryClient, permanent: bool = True) -> No
 def cleanup_specific_subjects(client: SchemaRegistryClient, subjects_to_clean: List[str], permanent: bool = True) -> None:
     """Clean up specific subjects in the destination registry.
     
+    Subjects are deleted concurrently using up to ``client.max_workers``
+    threads.
+    
     Args:
         client: The Schema Registry client
         subjects_to_clean: List of subject names to delete
@@ -1252,81 +1871,38 @@ def cleanup_specific_subjects(client: SchemaRegistryClient, subjects_to_clean: L
         
     logger.info(f"Cleaning up {len(subjects_to_clean)} specific subjects...")
     
+    # Check which subjects exist once, up front; each deletion invalidates the
+    # client's cached subject list
+    all_subjects = set(client.get_subjects())
+    logger.debug("All subjects in registry: %s", all_subjects)
+    existing_subjects = []
+    for subject in subjects_to_clean:
+        if subject not in all_subjects:
+            logger.info(f"Subject {subject} not found in subjects list, skipping")
+        else:
+            existing_subjects.append(subject)
+    
     success_count = 0
     failed_subjects = []
-    
-    for subject in subjects_to_clean:
-        try:
-            # First check if subject exists by trying to get it from the subjects list
-            all_subjects = client.get_subjects()
-            logger.debug(f"All subjects in registry: {all_subjects}")
-            logger.debug(f"Checking if '{subject}' is in subjects list...")
-            if subject not in all_subjects:
-                logger.info(f"Subject {subject} not found in subjects list, skipping")
-                continue
-            else:
-                logger.debug(f"Subject '{subject}' found in subjects list, proceeding with deletion")
-            
-            # Check if subject is in read-only mode and change it if needed
+    with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+        futures = {
+            executor.submit(_delete_subject, client, subject, permanent): subject
+            for subject in existing_subjects
+        }
+        for future in as_completed(futures):
             try:
-                subject_mode = client.get_subject_mode(subject)
-                if subject_mode != 'READWRITE':
-                    logger.info(f"Subject {subject} is in {subject_mode} mode, changing to READWRITE for deletion")
-                    client.set_subject_mode(subject, 'READWRITE')
-            except Exception as e:
-                logger.debug(f"Could not check/change mode for {subject}: {e}")
-            
-            # Add permanent=true parameter for hard delete
-            url = client._get_url(f"/subjects/{subject}")
-            
-            if permanent:
-                # For permanent delete, we need to do soft delete first
-                try:
-                    logger.debug(f"Performing soft delete for subject {subject}")
-                    response = client.session.delete(url)
-                    response.raise_for_status()
-                    logger.debug(f"Soft delete successful for subject {subject}")
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code != 404:
-                        logger.debug(f"Soft delete failed with status {e.response.status_code}: {e}")
-                
-                # Now perform hard delete
-                url += "?permanent=true"
-                logger.debug(f"Performing hard delete for subject {subject} with URL: {url}")
-            else:
-                logger.debug(f"Performing soft delete for subject {subject} with URL: {url}")
-            
-            response = client.session.delete(url)
-            response.raise_for_status()
-            logger.info(f"Successfully {'permanently' if permanent else 'soft'} deleted subject {subject}")
-            success_count += 1
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                logger.warning(f"Subject {subject} not found (may have been already deleted)")
-                continue
-            elif e.response.status_code == 422:
-                # 422 can occur when trying to permanently delete a subject that's in read-only mode
-                logger.warning(f"Cannot permanently delete subject {subject} (may be protected or in read-only mode)")
-                # Try soft delete instead
-                try:
-                    response = client.session.delete(client._get_url(f"/subjects/{subject}"))
-                    response.raise_for_status()
-                    logger.info(f"Successfully soft deleted subject {subject}")
-                    success_count += 1
-                except:
-                    logger.error(f"Could not delete subject {subject}")
-                    failed_subjects.append(subject)
-                continue
-            logger.error(f"Failed to delete subject {subject}: {e}")
-            failed_subjects.append(subject)
-        except Exception as e:
-            logger.error(f"Failed to delete subject {subject}: {e}")
-            failed_subjects.append(subject)
+                status = future.result()
+            except Exception:
+                # Already logged by _delete_subject
+                status = 'undeletable'
+            if status == 'deleted':
+                success_count += 1
+            elif status == 'undeletable':
+                failed_subjects.append(futures[future])
     
     if failed_subjects:
         logger.warning(f"Successfully cleaned {success_count} subjects, failed to clean {len(failed_subjects)} subjects")
-        logger.warning(f"Failed subjects: {', '.join(failed_subjects)}")
+        logger.warning(f"Failed subjects: {', '.join(sorted(failed_subjects))}")
     else:
         logger.info(f"Successfully cleaned all {success_count} specified subjects")
 
@@ -1426,9 +2002,8 @@ def compare_schema_versions(source_client: SchemaRegistryClient, dest_client: Sc
         if not comparison['schemas_match']:
             # Try to parse and compare as JSON for better error reporting
             try:
-                import json
-                source_json = json.loads(source_schema)
-                dest_json = json.loads(dest_schema)
+                source_json = _json_loads(source_schema)
+                dest_json = _json_loads(dest_schema)
                 
                 # Simple field comparison for AVRO schemas
                 if isinstance(source_json, dict) and isinstance(dest_json, dict):
@@ -1488,10 +2063,10 @@ def set_mode_for_all_subjects(client: SchemaRegistryClient, mode: str) -> None:
                 # Only update if mode is different
                 if current_mode != mode:
                     client.set_subject_mode(subject, mode)
-                    logger.debug(f"Changed subject {subject} mode from {current_mode} to {mode}")
+                    logger.debug("Changed subject %s mode from %s to %s", subject, current_mode, mode)
                     success_count += 1
                 else:
-                    logger.debug(f"Subject {subject} already in {mode} mode, skipping")
+                    logger.debug("Subject %s already in %s mode, skipping", subject, mode)
                     success_count += 1
                     
             except Exception as e:
@@ -1531,12 +2106,19 @@ def set_global_mode_after_migration(client: SchemaRegistryClient, mode: str) ->
         raise
 
 def main():
+    # Number of concurrent HTTP requests per registry
+    max_workers = int(os.getenv('MAX_PARALLEL_HTTP_REQUESTS', '10'))
+    # Optional directory for caching downloaded schema versions between runs
+    cache_dir = os.getenv('SCHEMA_CACHE_DIR') or None
+
     # Initialize source client
     source_client = SchemaRegistryClient(
         url=os.getenv('SOURCE_SCHEMA_REGISTRY_URL', 'http://localhost:8081'),
         username=os.getenv('SOURCE_USERNAME'),
         password=os.getenv('SOURCE_PASSWORD'),
-        context=os.getenv('SOURCE_CONTEXT')
+        context=os.getenv('SOURCE_CONTEXT'),
+        max_workers=max_workers,
+        cache_dir=cache_dir
     )
 
     # Initialize destination client with import mode
@@ -1545,6 +2127,8 @@ def main():
         username=os.getenv('DEST_USERNAME'),
         password=os.getenv('DEST_PASSWORD'),
         context=os.getenv('DEST_CONTEXT'),
+        max_workers=max_workers,
+        cache_dir=cache_dir
     )
 
     try:
@@ -1595,8 +2179,10 @@ def main():
                 logger.info("\nCleaning up destination registry before migration...")
                 permanent_delete = os.getenv('PERMANENT_DELETE', 'true').lower() == 'true'
                 cleanup_registry(dest_client, permanent=permanent_delete)
-                # Refresh destination schemas after cleanup
-                dest_schemas = dest_client.get_all_schemas()
+                # Cleanup leaves untouched any subject it could not delete, so a
+                # single subject listing is enough to refresh the snapshot
+                remaining_subjects = set(dest_client.get_subjects())
+                dest_schemas = {s: v for s, v in dest_schemas.items() if s in remaining_subjects}
             
             # Clean up specific subjects if specified
             cleanup_subjects_env = os.getenv('CLEANUP_SUBJECTS', '')
@@ -1606,8 +2192,8 @@ def main():
                     logger.info(f"\nCleaning up specific subjects: {', '.join(subjects_to_clean)}")
                     permanent_delete = os.getenv('PERMANENT_DELETE', 'true').lower() == 'true'
                     cleanup_specific_subjects(dest_client, subjects_to_clean, permanent=permanent_delete)
-                    # Refresh destination schemas after cleanup
-                    dest_schemas = dest_client.get_all_schemas()
+                    remaining_subjects = set(dest_client.get_subjects())
+                    dest_schemas = {s: v for s, v in dest_schemas.items() if s in remaining_subjects}
 
             # Perform migration (dry run by default)
             dry_run = os.getenv('DRY_RUN', 'true').lower() == 'true'
@@ -1629,7 +2215,8 @@ def main():
                 if preserve_ids:
                     logger.info("ID preservation is enabled")
             
-            migration_results = migrate_schemas(source_client, dest_client, dry_run=dry_run, preserve_ids=preserve_ids)
+            migration_results = migrate_schemas(source_client, dest_client, dry_run=dry_run, preserve_ids=preserve_ids,
+                                                source_schemas=source_schemas, dest_schemas=dest_schemas)
             display_migration_results(migration_results)
 
             # Retry failed migrations if enabled
@@ -1665,11 +2252,25 @@ def main():
             # Validate migration results
             if not dry_run:
                 logger.info("\nValidating migration results...")
-                # Get updated schemas from both registries
-                source_schemas = source_client.get_all_schemas()
+                # The source registry isn't modified by the migration, so the
+                # snapshot taken for the comparison is reused. The destination
+                # client's schema cache only refetches subjects that were
+                # registered to or deleted during the migration, or whose
+                # cached schemas are older than its cache_ttl.
                 dest_schemas = dest_client.get_all_schemas()
                 
-                # Check for missing items
+                # Check for missing items by diffing (subject, schema) keys, and
+                # (subject, schema, id) keys when IDs were meant to be preserved
+                dest_keys = {
+                    (subject, _record_fingerprint(v))
+                    for subject, versions in dest_schemas.items()
+                    for v in versions
+                }
+                dest_id_keys = {
+                    (subject, _record_fingerprint(v), v['id'])
+                    for subject, versions in dest_schemas.items()
+                    for v in versions
+                } if preserve_ids else set()
                 missing_items = []
                 for subject, versions in source_schemas.items():
                     if subject not in dest_schemas:
@@ -1679,14 +2280,20 @@ def main():
                         })
                         continue
                     
-                    dest_versions = dest_schemas[subject]
                     for version in versions:
-                        if not any(v['schema'] == version['schema'] for v in dest_versions):
+                        fingerprint = _record_fingerprint(version)
+                        if (subject, fingerprint) not in dest_keys:
                             missing_items.append({
                                 'subject': subject,
                                 'version': version['version'],
                                 'reason': 'Schema version not found in destination'
                             })
+                        elif preserve_ids and (subject, fingerprint, version['id']) not in dest_id_keys:
+                            missing_items.append({
+                                'subject': subject,
+                                'version': version['version'],
+                                'reason': f"Schema ID {version['id']} not preserved in destination"
+                            })
                 
                 if missing_items:
                     logger.warning("\nWARNING: Some items from source are missing in destination:")
@@ -1721,6 +2328,9 @@ def main():
     except requests.exceptions.RequestException as e:
         logger.error(f"Error connecting to Schema Registry: {e}")
         return 1
+    except RuntimeError as e:
+        logger.error(f"Migration aborted: {e}")
+        return 1
 
     return 0
 
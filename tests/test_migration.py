@@ -2,17 +2,24 @@
 
 import os
 import json
+import base64
 import requests
 import time
 import logging
 import subprocess
-from typing import Dict, List
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from unittest import mock
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import schema_registry_migrator
 from schema_registry_migrator import (
     SchemaRegistryClient, 
+    build_session,
     compare_schemas, 
     migrate_schemas, 
     display_results, 
@@ -77,6 +84,33 @@ def get_schemas(url: str) -> Dict[str, List[Dict]]:
         logger.error(f"Failed to get schemas from {url}: {e}")
         raise
 
+class StubRegistryHandler(BaseHTTPRequestHandler):
+    """Base request handler for local stub registries with scripted responses."""
+    
+    def log_message(self, *args):
+        pass
+    
+    def send_json(self, status: int, body, headers: Dict[str, str] = None):
+        """Send ``body`` as a JSON response with the registry's content type."""
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/vnd.schemaregistry.v1+json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_stub_registry(handler_class) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve ``handler_class`` on a free local port and return the server and its URL.
+    
+    Used for failure scenarios a real registry can't be made to produce on
+    demand. Call shutdown() and server_close() on the server when done.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
 def verify_migration(source_url: str, dest_url: str, import_mode: bool = False) -> bool:
     """Verify that schemas were migrated correctly."""
     try:
@@ -2458,6 +2492,837 @@ def run_test_version_gap_preservation() -> bool:
         logger.error(f"Test failed: {e}")
         return False
 
+def run_retry_backoff_test() -> bool:
+    """Test retries of transient failures, the backoff cap and Retry-After handling.
+    
+    Runs against a local stub server that answers with a scripted sequence
+    of status codes; time.sleep is patched to record the backoff delays.
+    """
+    scripted = []
+    served = []
+    
+    class ScriptedHandler(StubRegistryHandler):
+        def do_GET(self):
+            status, headers = scripted.pop(0) if scripted else (503, {})
+            served.append(status)
+            body = [] if status == 200 else {"error_code": 50301, "message": "unavailable"}
+            self.send_json(status, body, headers)
+    
+    server, url = start_stub_registry(ScriptedHandler)
+    try:
+        # Transient 503 and 429 are retried until the request succeeds;
+        # Retry-After (in seconds) is honoured
+        scripted[:] = [(503, {'Retry-After': '7'}), (429, {}), (200, {})]
+        served.clear()
+        with mock.patch('schema_registry_migrator.time.sleep') as sleep:
+            subjects = SchemaRegistryClient(url, max_retries=3).get_subjects()
+        delays = [call.args[0] for call in sleep.call_args_list]
+        if subjects != [] or served != [503, 429, 200]:
+            logger.error(f"Transient failures were not retried: served {served}")
+            return False
+        if delays[0] != 7 or not 2 <= delays[1] <= 3:
+            logger.error(f"Unexpected retry delays: {delays}")
+            return False
+        
+        # Persistent failures give up after max_retries with every delay
+        # capped at 30s, jitter included
+        scripted[:] = []
+        served.clear()
+        with mock.patch('schema_registry_migrator.time.sleep') as sleep:
+            try:
+                SchemaRegistryClient(url, max_retries=6).get_subjects()
+                logger.error("Persistent 503 responses did not raise")
+                return False
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code != 503:
+                    raise
+        delays = [call.args[0] for call in sleep.call_args_list]
+        if len(served) != 7 or len(delays) != 6 or max(delays) > 30:
+            logger.error(f"Unexpected retries for persistent failures: served {len(served)}, delays {delays}")
+            return False
+        
+        # Retry-After is capped at 60s
+        scripted[:] = [(503, {'Retry-After': '600'}), (200, {})]
+        served.clear()
+        with mock.patch('schema_registry_migrator.time.sleep') as sleep:
+            SchemaRegistryClient(url, max_retries=3).get_subjects()
+        if [call.args[0] for call in sleep.call_args_list] != [60.0]:
+            logger.error(f"Retry-After was not capped: {sleep.call_args_list}")
+            return False
+        
+        logger.info("Transient failures are retried with capped backoff")
+        return True
+    except Exception as e:
+        logger.error(f"Retry backoff test failed: {e}")
+        return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def run_dry_run_compatibility_none_test() -> bool:
+    """Test that a dry run skips compatibility checks for subjects with compatibility NONE.
+    
+    Subjects with another level, or whose level can't be read, still get a
+    compatibility check per version.
+    """
+    url = 'http://localhost:38082'
+    subject_none = 'test-dry-run-compat-none'
+    subject_backward = 'test-dry-run-compat-backward'
+    subject_forbidden = 'test-dry-run-compat-forbidden'
+    subjects = [subject_none, subject_backward, subject_forbidden]
+    schema_v1 = {"type": "record", "name": "DryRunCompat", "fields": [{"name": "id", "type": "int"}]}
+    schema_v2 = {
+        "type": "record",
+        "name": "DryRunCompat",
+        "fields": schema_v1["fields"] + [{"name": "name", "type": ["null", "string"], "default": None}]
+    }
+    try:
+        cleanup_destination()
+        time.sleep(1)
+        
+        dest_client = SchemaRegistryClient(url)
+        for subject in subjects:
+            dest_client.register_schema(subject, json.dumps(schema_v1))
+        dest_client.set_subject_compatibility(subject_none, 'NONE')
+        dest_client.set_subject_compatibility(subject_backward, 'BACKWARD')
+        
+        # The source has a new version for each subject
+        source_schemas = {
+            subject: [{'version': 2, 'id': 9000 + n, 'schema': json.dumps(schema_v2), 'schemaType': 'AVRO'}]
+            for n, subject in enumerate(subjects)
+        }
+        source_client = SchemaRegistryClient('http://localhost:38081')
+        
+        # Reading the forbidden subject's level fails as it would under RBAC
+        forbidden = requests.Response()
+        forbidden.status_code = 403
+        get_subject_compatibility = dest_client.get_subject_compatibility
+        def get_compatibility(subject):
+            if subject == subject_forbidden:
+                raise requests.exceptions.HTTPError("403 Forbidden", response=forbidden)
+            return get_subject_compatibility(subject)
+        
+        with mock.patch.object(source_client, 'get_all_schemas', return_value=source_schemas), \
+                mock.patch.object(dest_client, 'get_subject_compatibility', side_effect=get_compatibility), \
+                mock.patch.object(dest_client, 'check_schema_compatibility',
+                                  wraps=dest_client.check_schema_compatibility) as check:
+            results = migrate_schemas(source_client, dest_client, dry_run=True)
+        
+        checked = sorted(call.args[0] for call in check.call_args_list)
+        if checked != [subject_backward, subject_forbidden]:
+            logger.error(f"Expected compatibility checks only for {subject_backward} and {subject_forbidden}, got {checked}")
+            return False
+        if sorted(m['subject'] for m in results['successful']) != sorted(subjects) or results['failed']:
+            logger.error(f"Unexpected dry run results: {results}")
+            return False
+        
+        logger.info("Dry run skipped compatibility checks for the subject with compatibility NONE")
+        return True
+    except Exception as e:
+        logger.error(f"Dry run compatibility NONE test failed: {e}")
+        return False
+    finally:
+        cleanup_destination()
+
+def run_shared_session_auth_test() -> bool:
+    """Test that clients sharing one session each send only their own credentials."""
+    received = []
+    
+    class RecordingHandler(StubRegistryHandler):
+        def do_GET(self):
+            received.append(self.headers.get('Authorization'))
+            self.send_json(200, [])
+    
+    def basic_auth(username: str, password: str) -> str:
+        return 'Basic ' + base64.b64encode(f"{username}:{password}".encode('utf-8')).decode('ascii')
+    
+    server, url = start_stub_registry(RecordingHandler)
+    try:
+        session = build_session()
+        client_a = SchemaRegistryClient(url, username='user-a', password='secret-a', session=session, cache_ttl=0)
+        client_b = SchemaRegistryClient(url, username='user-b', password='secret-b', session=session, cache_ttl=0)
+        client_anonymous = SchemaRegistryClient(url, session=session, cache_ttl=0)
+        
+        for client in (client_a, client_b, client_anonymous, client_a):
+            client.get_subjects()
+        
+        expected = [basic_auth('user-a', 'secret-a'), basic_auth('user-b', 'secret-b'), None, basic_auth('user-a', 'secret-a')]
+        if received != expected:
+            logger.error(f"Clients sharing a session sent the wrong credentials: {received}")
+            return False
+        if session.auth is not None:
+            logger.error("Client credentials were written onto the shared session")
+            return False
+        
+        logger.info("Clients sharing a session send only their own credentials")
+        return True
+    except Exception as e:
+        logger.error(f"Shared session auth test failed: {e}")
+        return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def run_schema_disk_cache_test() -> bool:
+    """Test the on-disk schema cache: hits, invalidation, re-created subjects and pruning.
+    
+    The cache only backs the per-version fetch path, so the bulk /schemas
+    listing is disabled for this test.
+    """
+    url = 'http://localhost:38082'
+    subject_a = 'test-disk-cache-a'
+    subject_b = 'test-disk-cache-b'
+    
+    def make_schemas(name: str) -> List[str]:
+        fields = [{"name": "id", "type": "int"}]
+        schemas = []
+        for n in range(3):
+            if n:
+                fields = fields + [{"name": f"field{n}", "type": ["null", "string"], "default": None}]
+            schemas.append(json.dumps({"type": "record", "name": name, "fields": fields}))
+        return schemas
+    
+    schemas = make_schemas("DiskCache")
+    
+    def read_cache(cache_dir: str) -> Dict:
+        files = [name for name in os.listdir(cache_dir) if name.endswith('.json')]
+        if len(files) != 1:
+            raise Exception(f"Expected one schema cache file, found {files}")
+        with open(os.path.join(cache_dir, files[0])) as f:
+            return json.load(f)
+    
+    try:
+        cleanup_destination()
+        time.sleep(1)
+        
+        setup_client = SchemaRegistryClient(url)
+        setup_client.register_schema(subject_a, schemas[0])
+        setup_client.register_schema(subject_a, schemas[1])
+        setup_client.register_schema(subject_b, schemas[0])
+        
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.object(SchemaRegistryClient, 'get_schemas_bulk', return_value=None):
+            # First run downloads every version and writes the cache
+            expected = SchemaRegistryClient(url, cache_dir=cache_dir).get_all_schemas()
+            cache = read_cache(cache_dir)
+            if sorted(cache.get(subject_a, {})) != ['1', '2'] or sorted(cache.get(subject_b, {})) != ['1']:
+                logger.error(f"Schema cache was not written: {cache}")
+                return False
+            
+            # A new client with the same cache directory only downloads the
+            # newest cached version of each subject to validate the cache
+            client = SchemaRegistryClient(url, cache_dir=cache_dir)
+            client.get_schema = mock.Mock(wraps=client.get_schema)
+            if client.get_all_schemas() != expected or client.get_schema.call_count != 2:
+                logger.error(f"Cached versions were downloaded again ({client.get_schema.call_count} requests)")
+                return False
+            
+            # Registering to a subject drops its cached versions
+            client.register_schema(subject_a, schemas[2])
+            client.get_schema.reset_mock()
+            all_schemas = client.get_all_schemas()
+            if [v['version'] for v in all_schemas[subject_a]] != [1, 2, 3] or client.get_schema.call_count != 3:
+                logger.error(f"Cache was not invalidated after register ({client.get_schema.call_count} requests)")
+                return False
+            if sorted(read_cache(cache_dir)[subject_a]) != ['1', '2', '3']:
+                logger.error("Schema cache was not updated after register")
+                return False
+            
+            # Deleting a subject drops it from the cache
+            cleanup_specific_subjects(client, [subject_b], permanent=True)
+            client.get_all_schemas()
+            if subject_b in read_cache(cache_dir):
+                logger.error("Deleted subject is still in the schema cache")
+                return False
+            
+            # A subject deleted and re-created by someone else since the cache
+            # was written is downloaded again instead of served from the cache
+            cleanup_specific_subjects(setup_client, [subject_a], permanent=True)
+            for schema in make_schemas("DiskCacheRecreated"):
+                setup_client.register_schema(subject_a, schema)
+            expected_versions = [(v['version'], v['id'], v['schema']) for v in get_schemas(url)[subject_a]]
+            all_schemas = SchemaRegistryClient(url, cache_dir=cache_dir).get_all_schemas()
+            if [(v['version'], v['id'], v['schema']) for v in all_schemas[subject_a]] != expected_versions:
+                logger.error("Stale cached versions were returned for a re-created subject")
+                return False
+            cached_ids = {int(version): entry['id'] for version, entry in read_cache(cache_dir)[subject_a].items()}
+            if cached_ids != {version: schema_id for version, schema_id, _ in expected_versions}:
+                logger.error(f"Schema cache was not refreshed for a re-created subject: {cached_ids}")
+                return False
+            
+            # Subjects removed by someone else are pruned on the next run
+            cleanup_specific_subjects(setup_client, [subject_a], permanent=True)
+            SchemaRegistryClient(url, cache_dir=cache_dir).get_all_schemas()
+            if read_cache(cache_dir):
+                logger.error(f"Removed subjects were not pruned from the schema cache: {read_cache(cache_dir)}")
+                return False
+        
+        logger.info("Schema disk cache is reused, validated, invalidated and pruned correctly")
+        return True
+    except Exception as e:
+        logger.error(f"Schema disk cache test failed: {e}")
+        return False
+    finally:
+        cleanup_destination()
+
+def run_bulk_schemas_paging_test() -> bool:
+    """Test that the paged /schemas listing returns every version of every subject."""
+    original_page_size = schema_registry_migrator.BULK_SCHEMAS_PAGE_SIZE
+    try:
+        cleanup_destination()
+        time.sleep(1)
+        
+        client = SchemaRegistryClient('http://localhost:38082')
+        
+        # 5 subjects x 3 versions, read back in pages of 4 so that pages end
+        # in the middle of a subject
+        subjects = [f"test-bulk-paging-{i}" for i in range(5)]
+        for subject in subjects:
+            fields = [{"name": "id", "type": "int"}]
+            for n in range(3):
+                if n:
+                    fields.append({"name": f"field{n}", "type": ["null", "string"], "default": None})
+                schema = {"type": "record", "name": f"BulkPaging{subject[-1]}", "fields": fields}
+                client.register_schema(subject, json.dumps(schema))
+        
+        schema_registry_migrator.BULK_SCHEMAS_PAGE_SIZE = 4
+        
+        bulk_schemas = client.get_schemas_bulk()
+        if bulk_schemas is None:
+            logger.error("Bulk /schemas endpoint is not available")
+            return False
+        
+        expected = get_schemas('http://localhost:38082')
+        for subject in subjects:
+            bulk_versions = [(v['version'], v['id'], v['schema']) for v in bulk_schemas.get(subject, [])]
+            expected_versions = [(v['version'], v['id'], v['schema']) for v in expected[subject]]
+            if bulk_versions != expected_versions:
+                logger.error(f"Bulk listing for {subject} returned {[v[0] for v in bulk_versions]}, "
+                             f"expected {[v[0] for v in expected_versions]}")
+                return False
+        
+        # A fresh client goes through the bulk listing on its cold cache
+        all_schemas = SchemaRegistryClient('http://localhost:38082').get_all_schemas()
+        for subject in subjects:
+            if [v['version'] for v in all_schemas.get(subject, [])] != [1, 2, 3]:
+                logger.error(f"get_all_schemas returned incomplete versions for {subject}")
+                return False
+        
+        logger.info("Paged /schemas listing returned all schema versions")
+        return True
+    except Exception as e:
+        logger.error(f"Bulk schemas paging test failed: {e}")
+        return False
+    finally:
+        schema_registry_migrator.BULK_SCHEMAS_PAGE_SIZE = original_page_size
+        cleanup_destination()
+
+def run_cleanup_undeletable_subject_test() -> bool:
+    """Test that CLEANUP_SUBJECTS reports a subject that can't be deleted (422) as failed.
+    
+    Runs cleanup_specific_subjects against a local stub server on which one
+    subject rejects every delete with 422 and another deletes normally.
+    """
+    deletable = 'test-cleanup-deletable'
+    locked = 'test-cleanup-locked'
+    
+    class UndeletableHandler(StubRegistryHandler):
+        def do_GET(self):
+            if self.path == '/subjects':
+                self.send_json(200, [deletable, locked])
+            else:
+                self.send_json(404, {"error_code": 40401, "message": "Subject not found"})
+        
+        def do_DELETE(self):
+            if self.path.startswith(f"/subjects/{locked}"):
+                self.send_json(422, {"error_code": 42205, "message": "Subject cannot be deleted"})
+            else:
+                self.send_json(200, [1])
+    
+    server, url = start_stub_registry(UndeletableHandler)
+    try:
+        client = SchemaRegistryClient(url)
+        with mock.patch.object(schema_registry_migrator.logger, 'warning') as warning:
+            cleanup_specific_subjects(client, [deletable, locked], permanent=True)
+        messages = [call.args[0] for call in warning.call_args_list]
+        if "Successfully cleaned 1 subjects, failed to clean 1 subjects" not in messages:
+            logger.error(f"Cleanup did not count the undeletable subject as failed: {messages}")
+            return False
+        if f"Failed subjects: {locked}" not in messages:
+            logger.error(f"Cleanup did not report the undeletable subject: {messages}")
+            return False
+        
+        logger.info("Undeletable subject was reported as failed")
+        return True
+    except Exception as e:
+        logger.error(f"Cleanup undeletable subject test failed: {e}")
+        return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def run_cleanup_partial_failure_test() -> bool:
+    """Test that a partially failed destination cleanup raises and aborts main().
+    
+    Runs against local stub servers: an empty source registry and a
+    destination on which one subject rejects every delete with 403 while
+    the other deletes normally.
+    """
+    deletable = 'test-cleanup-deletable'
+    forbidden = 'test-cleanup-forbidden'
+    deleted = []
+    registered = []
+    
+    class EmptySourceHandler(StubRegistryHandler):
+        def do_GET(self):
+            if self.path == '/subjects':
+                self.send_json(200, [])
+            else:
+                self.send_json(404, {"error_code": 40401, "message": "Not found"})
+    
+    class PartialCleanupHandler(StubRegistryHandler):
+        def do_GET(self):
+            if self.path == '/subjects':
+                self.send_json(200, [deletable, forbidden])
+            elif self.path.startswith('/schemas?') and '&offset=0&' in self.path:
+                self.send_json(200, [
+                    {"subject": subject, "version": 1, "id": n,
+                     "schema": '{"type": "string"}'}
+                    for n, subject in enumerate([deletable, forbidden], start=1)
+                ])
+            elif self.path.startswith('/schemas?'):
+                self.send_json(200, [])
+            else:
+                self.send_json(404, {"error_code": 40401, "message": "Not found"})
+        
+        def do_DELETE(self):
+            if self.path.startswith(f"/subjects/{forbidden}"):
+                self.send_json(403, {"error_code": 40301, "message": "Forbidden"})
+            else:
+                deleted.append(self.path)
+                self.send_json(200, [1])
+        
+        def do_POST(self):
+            registered.append(self.path)
+            self.send_json(200, {"id": 1})
+    
+    source_server, source_url = start_stub_registry(EmptySourceHandler)
+    dest_server, dest_url = start_stub_registry(PartialCleanupHandler)
+    try:
+        try:
+            cleanup_registry(SchemaRegistryClient(dest_url), permanent=True)
+            logger.error("cleanup_registry did not raise on a partial failure")
+            return False
+        except RuntimeError as e:
+            if str(e) != f"Failed to delete 1 of 2 subjects: {forbidden}":
+                logger.error(f"Unexpected cleanup error: {e}")
+                return False
+        if not any(path.startswith(f"/subjects/{deletable}") for path in deleted):
+            logger.error("The deletable subject was not deleted")
+            return False
+        
+        env = {
+            'SOURCE_SCHEMA_REGISTRY_URL': source_url,
+            'DEST_SCHEMA_REGISTRY_URL': dest_url,
+            'ENABLE_MIGRATION': 'true',
+            'CLEANUP_DESTINATION': 'true',
+            'DRY_RUN': 'false',
+            'SCHEMA_CACHE_DIR': ''
+        }
+        with mock.patch.dict(os.environ, env):
+            exit_code = schema_registry_migrator.main()
+        if exit_code != 1:
+            logger.error(f"main() returned {exit_code} after a partial cleanup failure, expected 1")
+            return False
+        if registered:
+            logger.error(f"Migration went ahead after the cleanup failed: {registered}")
+            return False
+        
+        logger.info("Partial cleanup failure aborted the migration")
+        return True
+    except Exception as e:
+        logger.error(f"Cleanup partial failure test failed: {e}")
+        return False
+    finally:
+        for server in (source_server, dest_server):
+            server.shutdown()
+            server.server_close()
+
+def run_schema_fingerprint_test() -> bool:
+    """Test that schema fingerprints ignore formatting but not meaning.
+    
+    Reformatted and key-reordered AVRO and JSON schemas must compare equal,
+    reordered record fields must not, and PROTOBUF schemas are compared as
+    raw text. Runs offline against the fingerprint helpers and
+    compare_schemas.
+    """
+    fingerprint = schema_registry_migrator._schema_fingerprint
+    avro = '{"type": "record", "name": "User", "fields": [{"name": "id", "type": "int"}, {"name": "name", "type": "string"}]}'
+    avro_reformatted = json.dumps(json.loads(avro), indent=2)
+    avro_reordered_keys = '{"fields": [{"type": "int", "name": "id"}, {"type": "string", "name": "name"}], "name": "User", "type": "record"}'
+    avro_reordered_fields = '{"type": "record", "name": "User", "fields": [{"name": "name", "type": "string"}, {"name": "id", "type": "int"}]}'
+    json_schema = '{"type": "object", "properties": {"id": {"type": "integer"}}, "required": ["id"]}'
+    json_schema_reformatted = '{\n  "required": ["id"],\n  "properties": {"id": {"type": "integer"}},\n  "type": "object"\n}'
+    proto = 'syntax = "proto3";\nmessage User {\n  int32 id = 1;\n}\n'
+    proto_reformatted = 'syntax = "proto3";\n\nmessage User {\n    int32 id = 1;\n}\n'
+    
+    try:
+        if not (fingerprint(avro) == fingerprint(avro_reformatted) == fingerprint(avro_reordered_keys)):
+            logger.error("Reformatted AVRO schemas have different fingerprints")
+            return False
+        if fingerprint(json_schema) != fingerprint(json_schema_reformatted):
+            logger.error("Reformatted JSON schemas have different fingerprints")
+            return False
+        if fingerprint(avro) == fingerprint(avro_reordered_fields):
+            logger.error("AVRO schemas with reordered fields have the same fingerprint")
+            return False
+        if schema_registry_migrator._canonical_schema(proto) != proto.encode('utf-8'):
+            logger.error("PROTOBUF schema was not used verbatim")
+            return False
+        if fingerprint(proto) == fingerprint(proto_reformatted):
+            logger.error("Differently formatted PROTOBUF schemas have the same fingerprint")
+            return False
+        
+        # compare_schemas reports only the reordered fields as a difference
+        def versions(*schemas):
+            return [
+                schema_registry_migrator._schema_record(n, {"id": n, "schema": schema})
+                for n, schema in enumerate(schemas, start=1)
+            ]
+        comparison, _ = compare_schemas(
+            {'test-fingerprint': versions(avro, json_schema, avro)},
+            {'test-fingerprint': versions(avro_reformatted, json_schema_reformatted, avro_reordered_fields)}
+        )
+        differing = [d['version'] for d in comparison['schema_differences']]
+        if differing != [3]:
+            logger.error(f"compare_schemas reported schema differences for versions {differing}, expected [3]")
+            return False
+        
+        logger.info("Schema fingerprints ignore formatting and keep field order")
+        return True
+    except Exception as e:
+        logger.error(f"Schema fingerprint test failed: {e}")
+        return False
+
+def run_schema_cache_ttl_test() -> bool:
+    """Test that cached subject schemas expire after the client's cache_ttl.
+    
+    Runs against a local stub server without the bulk /schemas endpoint, to
+    which a second schema version is added after the first read, as another
+    client writing to the registry would.
+    """
+    subject = 'test-schema-cache-ttl'
+    registered = [{"subject": subject, "version": 1, "id": 1, "schema": '{"type": "string"}'}]
+    
+    class GrowingSubjectHandler(StubRegistryHandler):
+        def do_GET(self):
+            if self.path == '/subjects':
+                self.send_json(200, [subject])
+            elif self.path == f"/subjects/{subject}/versions":
+                self.send_json(200, [v['version'] for v in registered])
+            elif self.path.startswith(f"/subjects/{subject}/versions/"):
+                version = int(self.path.rsplit('/', 1)[1])
+                self.send_json(200, registered[version - 1])
+            else:
+                self.send_json(404, {"error_code": 40401, "message": "Not found"})
+    
+    server, url = start_stub_registry(GrowingSubjectHandler)
+    try:
+        client = SchemaRegistryClient(url, cache_ttl=60)
+        client.get_all_schemas()
+        cached_at = client._schema_cache[subject][0]
+        
+        registered.append({"subject": subject, "version": 2, "id": 2, "schema": '{"type": "int"}'})
+        
+        # Within the TTL the cached schema list is served as-is
+        versions = [v['version'] for v in client.get_all_schemas()[subject]]
+        if versions != [1]:
+            logger.error(f"Fresh schema cache was not used, got versions {versions}")
+            return False
+        if client._schema_cache[subject][0] != cached_at:
+            logger.error("Serving a subject from the schema cache reset its age")
+            return False
+        
+        # Once expired, the subject's schemas are downloaded again
+        client.cache_ttl = 0
+        versions = [v['version'] for v in client.get_all_schemas()[subject]]
+        if versions != [1, 2]:
+            logger.error(f"Expired schema cache was reused, got versions {versions}")
+            return False
+        if client.get_schema(subject, 2)['id'] != 2:
+            logger.error("get_schema did not fetch the new version")
+            return False
+        
+        logger.info("Schema cache expires after cache_ttl")
+        return True
+    except Exception as e:
+        logger.error(f"Schema cache TTL test failed: {e}")
+        return False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def run_preserve_ids_validation_report_test() -> bool:
+    """Test that main() reports schema IDs that were not preserved in the destination.
+    
+    Runs main() offline: registry reads and the migration itself are mocked
+    so that, after the migration, the destination holds every source
+    schema but one of them under a different ID.
+    """
+    subject = 'test-preserve-ids-report'
+    
+    def schema_versions(*ids):
+        return [
+            schema_registry_migrator._schema_record(version, {
+                "id": schema_id,
+                "schema": json.dumps({"type": "record", "name": "Report", "fields": [
+                    {"name": f"field{n}", "type": "int"} for n in range(version)
+                ]})
+            })
+            for version, schema_id in enumerate(ids, start=1)
+        ]
+    
+    dest_reads = []
+    
+    def get_all_schemas(client):
+        if client.url == 'http://source.invalid':
+            return {subject: schema_versions(101, 102)}
+        dest_reads.append(client.url)
+        # Empty before the migration; afterwards version 2 has a new ID
+        return {} if len(dest_reads) == 1 else {subject: schema_versions(101, 202)}
+    
+    env = {
+        'SOURCE_SCHEMA_REGISTRY_URL': 'http://source.invalid',
+        'DEST_SCHEMA_REGISTRY_URL': 'http://dest.invalid',
+        'ENABLE_MIGRATION': 'true',
+        'DRY_RUN': 'false',
+        'PRESERVE_IDS': 'true',
+        'RETRY_FAILED': 'false',
+        'CLEANUP_DESTINATION': 'false',
+        'CLEANUP_SUBJECTS': '',
+        'DEST_IMPORT_MODE': 'false',
+        'SCHEMA_CACHE_DIR': ''
+    }
+    try:
+        with mock.patch.dict(os.environ, env), \
+                mock.patch.object(SchemaRegistryClient, 'get_all_schemas', autospec=True, side_effect=get_all_schemas), \
+                mock.patch.object(schema_registry_migrator, 'migrate_schemas',
+                                  return_value={'successful': [], 'failed': [], 'skipped': []}), \
+                mock.patch.object(schema_registry_migrator, 'set_global_mode_after_migration'), \
+                mock.patch.object(schema_registry_migrator.logger, 'warning') as warning:
+            exit_code = schema_registry_migrator.main()
+        
+        if exit_code != 0:
+            logger.error(f"main() returned {exit_code}, expected 0")
+            return False
+        if len(dest_reads) != 2:
+            logger.error(f"Destination was read {len(dest_reads)} times, expected before and after migrating")
+            return False
+        messages = [call.args[0] for call in warning.call_args_list]
+        expected = f"Subject: {subject}, Version: 2 - Schema ID 102 not preserved in destination"
+        if expected not in messages:
+            logger.error(f"Validation did not report the changed schema ID: {messages}")
+            return False
+        if any('Version: 1 -' in message for message in messages):
+            logger.error(f"Validation reported the preserved version: {messages}")
+            return False
+        
+        logger.info("Validation reported the schema ID that was not preserved")
+        return True
+    except Exception as e:
+        logger.error(f"Preserve IDs validation report test failed: {e}")
+        return False
+
+def run_compatibility_cache_invalidation_test() -> bool:
+    """Test that changing a compatibility level invalidates cached compatibility checks.
+    
+    A schema that adds a field without a default is rejected under BACKWARD
+    and accepted under NONE; each level change made through the client must
+    be reflected by the next check_schema_compatibility call, at subject
+    and at global level.
+    """
+    subject = 'test-compat-cache-invalidation'
+    base = {"type": "record", "name": "CompatCache", "fields": [{"name": "id", "type": "int"}]}
+    incompatible = json.dumps({**base, "fields": base["fields"] + [{"name": "name", "type": "string"}]})
+    client = SchemaRegistryClient('http://localhost:38082', cache_ttl=300)
+    original_global = None
+    try:
+        cleanup_destination()
+        time.sleep(1)
+        original_global = client.get_global_compatibility()
+        client.register_schema(subject, json.dumps(base))
+        
+        # Subject level
+        client.set_subject_compatibility(subject, 'BACKWARD')
+        if client.check_schema_compatibility(subject, incompatible):
+            logger.error("Schema was compatible under subject-level BACKWARD")
+            return False
+        client.set_subject_compatibility(subject, 'NONE')
+        if client.get_subject_compatibility(subject) != 'NONE':
+            logger.error("Cached subject compatibility was not updated")
+            return False
+        if not client.check_schema_compatibility(subject, incompatible):
+            logger.error("Cached check was reused after setting subject compatibility to NONE")
+            return False
+        
+        # Global level, with no subject-level override
+        client.delete_subject_compatibility(subject)
+        client.set_global_compatibility('BACKWARD')
+        if client.check_schema_compatibility(subject, incompatible):
+            logger.error("Schema was compatible under global BACKWARD")
+            return False
+        client.set_global_compatibility('NONE')
+        if client.get_global_compatibility() != 'NONE':
+            logger.error("Cached global compatibility was not updated")
+            return False
+        if not client.check_schema_compatibility(subject, incompatible):
+            logger.error("Cached check was reused after setting global compatibility to NONE")
+            return False
+        
+        logger.info("Compatibility level changes invalidated cached checks")
+        return True
+    except Exception as e:
+        logger.error(f"Compatibility cache invalidation test failed: {e}")
+        return False
+    finally:
+        if original_global is not None:
+            try:
+                client.set_global_compatibility(original_global)
+            except Exception as e:
+                logger.warning(f"Could not restore global compatibility: {e}")
+        cleanup_destination()
+
+def run_parallel_subject_migration_test() -> bool:
+    """Test migrating several subjects concurrently, one of which fails unexpectedly.
+    
+    Uses max_workers > 1 against the destination registry. Registering to
+    one read-only subject is rejected with 409 and the follow-up lookup
+    errors out; that subject must be reported as failed without aborting
+    the others, results must be merged in source subject order, and both
+    read-only subjects must be back in READONLY mode afterwards.
+    """
+    new_a = 'test-parallel-new-a'
+    readonly = 'test-parallel-readonly'
+    failing = 'test-parallel-failing'
+    new_b = 'test-parallel-new-b'
+    
+    def schema(subject, n):
+        fields = [{"name": "id", "type": "int"}] + [
+            {"name": f"field{i}", "type": ["null", "string"], "default": None} for i in range(1, n)
+        ]
+        return json.dumps({"type": "record", "name": subject.replace('-', '_'), "fields": fields})
+    
+    source_schemas = {
+        subject: [
+            schema_registry_migrator._schema_record(n, {"id": 500 + 10 * i + n, "schema": schema(subject, n)})
+            for n in range(1, count + 1)
+        ]
+        for i, (subject, count) in enumerate([(new_a, 2), (readonly, 2), (failing, 2), (new_b, 1)])
+    }
+    
+    dest_client = SchemaRegistryClient('http://localhost:38082', max_workers=4)
+    register_schema = dest_client.register_schema
+    get_latest_version = dest_client.get_latest_version
+    
+    def register_or_conflict(subject, *args, **kwargs):
+        if subject == failing:
+            response = requests.Response()
+            response.status_code = 409
+            raise requests.exceptions.HTTPError("409 Conflict", response=response)
+        return register_schema(subject, *args, **kwargs)
+    
+    def latest_version_or_error(subject):
+        if subject == failing:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return get_latest_version(subject)
+    
+    try:
+        cleanup_destination()
+        time.sleep(1)
+        for subject in (readonly, failing):
+            dest_client.register_schema(subject, source_schemas[subject][0]['schema'])
+            dest_client.set_subject_mode(subject, 'READONLY')
+        dest_schemas = dest_client.get_all_schemas()
+        
+        with mock.patch.dict(os.environ, {'AUTO_HANDLE_COMPATIBILITY': 'false'}), \
+                mock.patch.object(dest_client, 'register_schema', side_effect=register_or_conflict), \
+                mock.patch.object(dest_client, 'get_latest_version', side_effect=latest_version_or_error):
+            results = migrate_schemas(
+                SchemaRegistryClient('http://localhost:38081'), dest_client, dry_run=False,
+                source_schemas=source_schemas, dest_schemas=dest_schemas
+            )
+        
+        expected = {
+            'successful': [(new_a, 1), (new_a, 2), (readonly, 2), (new_b, 1)],
+            'skipped': [(readonly, 1), (failing, 1)],
+            'failed': [(failing, 2)]
+        }
+        for status, keys in expected.items():
+            actual = [(entry['subject'], entry['version']) for entry in results[status]]
+            if actual != keys:
+                logger.error(f"Unexpected {status} results: {actual}, expected {keys}")
+                return False
+        if 'connection reset' not in results['failed'][0]['reason']:
+            logger.error(f"Unexpected failure reason: {results['failed'][0]['reason']}")
+            return False
+        
+        for subject in (readonly, failing):
+            if not verify_subject_mode('http://localhost:38082', subject, 'READONLY'):
+                return False
+        
+        logger.info("Subjects were migrated concurrently and the failing subject was isolated")
+        return True
+    except Exception as e:
+        logger.error(f"Parallel subject migration test failed: {e}")
+        return False
+    finally:
+        try:
+            cleanup_registry(SchemaRegistryClient('http://localhost:38082'))
+        except Exception as e:
+            logger.warning(f"Could not clean up after parallel subject migration test: {e}")
+
+def run_schema_exists_cache_invalidation_test() -> bool:
+    """Test that registering a schema invalidates cached check_schema_exists misses.
+    
+    A 404 from check_schema_exists is cached per subject; the same lookup
+    must hit the registry again, and find the schema, once this client has
+    registered it. Covers both a subject that doesn't exist yet and a new
+    version of an existing subject.
+    """
+    subject = 'test-exists-cache-invalidation'
+    base = {"type": "record", "name": "ExistsCache", "fields": [{"name": "id", "type": "int"}]}
+    schema_v1 = json.dumps(base)
+    schema_v2 = json.dumps({**base, "fields": base["fields"] + [
+        {"name": "name", "type": ["null", "string"], "default": None}
+    ]})
+    client = SchemaRegistryClient('http://localhost:38082', cache_ttl=300)
+    try:
+        cleanup_destination()
+        time.sleep(1)
+        
+        for schema in (schema_v1, schema_v2):
+            if client.check_schema_exists(subject, schema) is not None:
+                logger.error("Schema was found before it was registered")
+                return False
+            with mock.patch.object(client, '_request', wraps=client._request) as request:
+                if client.check_schema_exists(subject, schema) is not None or request.call_count != 0:
+                    logger.error("Schema lookup miss was not cached")
+                    return False
+            
+            registered_id = client.register_schema(subject, schema)['id']
+            existing = client.check_schema_exists(subject, schema)
+            if existing is None or existing.get('id') != registered_id:
+                logger.error(f"Cached lookup miss was served after registering: {existing}")
+                return False
+        
+        logger.info("Registering a schema invalidated cached lookup misses")
+        return True
+    except Exception as e:
+        logger.error(f"Schema exists cache invalidation test failed: {e}")
+        return False
+    finally:
+        cleanup_destination()
+
 class TestMigration(unittest.TestCase):
     def setUp(self):
         pass
@@ -2719,7 +3584,20 @@ def main():
         (21, "Global mode unit test", test_set_mode_for_all_subjects_unit),
         (22, "Selective subject cleanup test", run_test_cleanup_specific_subjects),
         (23, "Schema version comparison test", run_test_compare_schema_versions),
-        (24, "Version gap preservation test", run_test_version_gap_preservation)
+        (24, "Version gap preservation test", run_test_version_gap_preservation),
+        (25, "Retry backoff test", run_retry_backoff_test),
+        (26, "Dry run compatibility NONE test", run_dry_run_compatibility_none_test),
+        (27, "Shared session auth test", run_shared_session_auth_test),
+        (28, "Schema disk cache test", run_schema_disk_cache_test),
+        (29, "Bulk schemas paging test", run_bulk_schemas_paging_test),
+        (30, "Cleanup undeletable subject test", run_cleanup_undeletable_subject_test),
+        (31, "Cleanup partial failure test", run_cleanup_partial_failure_test),
+        (32, "Schema fingerprint test", run_schema_fingerprint_test),
+        (33, "Schema cache TTL test", run_schema_cache_ttl_test),
+        (34, "Preserve IDs validation report test", run_preserve_ids_validation_report_test),
+        (35, "Compatibility cache invalidation test", run_compatibility_cache_invalidation_test),
+        (36, "Parallel subject migration test", run_parallel_subject_migration_test),
+        (37, "Schema exists cache invalidation test", run_schema_exists_cache_invalidation_test)
     ]
 
     success = True